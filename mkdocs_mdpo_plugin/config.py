@@ -7,6 +7,14 @@ from mkdocs.config.base import ValidationError
 from mkdocs.config.config_options import Type
 
 from mkdocs_mdpo_plugin import __file__ as installation_path
+from mkdocs_mdpo_plugin.extensions import (
+    build_text_node_filter,
+    build_title_node_filter,
+)
+from mkdocs_mdpo_plugin.mdpo_events import (
+    build_md2po_events,
+    build_po2md_events,
+)
 from mkdocs_mdpo_plugin.mkdocs_utils import get_lunr_languages
 
 
@@ -25,9 +33,13 @@ CONFIG_SCHEME = (
     ('ignore_extensions', Type(list, default=['.po', '.pot', '.mo'])),
     ('ignore_msgids', Type(list, default=[])),
     ('cross_language_search', Type(bool, default=True)),
+    ('shared_search_index', Type(bool, default=False)),
+    ('search_index_shard_size', Type(int, default=None)),
     ('min_translated_messages', Type((str, int), default=None)),
     ('exclude', Type(list, default=[])),
     ('translate', Type(list, default=[])),
+    ('translated_files_in_memory', Type(bool, default=False)),
+    ('render_from_original_tree', Type(bool, default=False)),
 )
 
 
@@ -40,6 +52,8 @@ def on_config_event(plugin, config, **kwargs):
     * Configures md4c extensions accordingly to Python-Markdown extensions.
     * Stores the Markdown extensions used in the build in the
       ``extensions.markdown`` property of the plugin instance.
+    * Builds the mdpo events used to extract and translate pages and the
+      nodes filters of the ``mkdocs-mdpo`` extension.
     * Creates the persistent files cache for the project.
     """
     if plugin.config['lc_messages'] is True:
@@ -220,6 +234,18 @@ def on_config_event(plugin, config, **kwargs):
         else:
             plugin.config['min_translated_messages'] = min_translated
 
+    # check that the size of search index shards is a positive number
+    shard_size = plugin.config.get('search_index_shard_size')
+    if shard_size is not None and (
+        isinstance(shard_size, bool) or
+        not isinstance(shard_size, int) or
+        shard_size <= 0
+    ):
+        raise ValidationError(
+            f"The value '{shard_size}' for 'search_index_shard_size'"
+            ' config setting is not a positive number of bytes.',
+        )
+
     # check that 'exclude' contains a valid list
     exclude = plugin.config.get('exclude', [])
     if not isinstance(exclude, list):
@@ -262,4 +288,20 @@ def on_config_event(plugin, config, **kwargs):
     # store reference in plugin to markdown_extensions for later usage
     plugin.extensions.markdown = markdown_extensions
 
+    # mdpo events depend only on the extensions, so are built once per build
+    plugin.extensions.md2po_events = build_md2po_events(
+        markdown_extensions or [],
+    )
+    plugin.extensions.po2md_events = build_po2md_events(
+        markdown_extensions or [],
+    )
+
+    # same for the nodes filters of the tree processors
+    plugin.extensions.text_node_filter = build_text_node_filter(
+        markdown_extensions or [],
+    )
+    plugin.extensions.title_node_filter = build_title_node_filter(
+        markdown_extensions or [],
+    )
+
     # ----------------------------------------------------------
@@ -1,162 +1,469 @@
+import copy
+import itertools
+
 import polib
 from markdown.extensions import Extension
 from markdown.treeprocessors import Treeprocessor
+from mdpo.md2po import Md2Po
 from mdpo.md4c import DEFAULT_MD4C_GENERIC_PARSER_EXTENSIONS
 
 from mkdocs_mdpo_plugin.mkdocs_utils import MkdocsBuild
 
 
+TASKLIST_MARKERS = {'[ ]', '[x]', '[X]'}
+EMOJI_CLASSES = {'emojione', 'twemoji', 'gemoji'}
+
+
+def build_text_node_filter(markdown_extensions):
+    """Build the function that discards nodes whose text must not be
+    translated, depending on the Markdown extensions of the build.
+
+    Returns ``None`` if no node must be discarded.
+    """
+    if 'pymdownx.tasklist' in markdown_extensions:
+        return lambda node: not (
+            node.tag == 'li' and node.text[:3] in TASKLIST_MARKERS
+        )
+    return None
+
+
+def build_title_node_filter(markdown_extensions):
+    """Build the function that discards nodes whose title must not be
+    translated, depending on the Markdown extensions of the build.
+
+    Returns ``None`` if no node must be discarded.
+    """
+    if 'abbr' in markdown_extensions:
+        if 'pymdownx.emoji' in markdown_extensions:
+            return lambda node: (
+                node.tag != 'abbr' and node.get('class') not in EMOJI_CLASSES
+            )
+        return lambda node: node.tag != 'abbr'
+    elif 'pymdownx.emoji' in markdown_extensions:
+        return lambda node: node.get('class') not in EMOJI_CLASSES
+    return None
+
+
+def _translation_entries(tr, msgid):
+    """Get the entries of the current translation for a msgid, adding it
+    to the PO file if is not found.
+    """
+    if msgid not in tr.translated_msgstrs:
+        entries = tr.po.msgid_entries.get(msgid)
+        if entries:
+            return entries
+        elif msgid not in tr.disabled_msgids:
+            tr.po.append(polib.POEntry(msgid=msgid, msgstr=''))
+    return ()
+
+
+def _iter_descendants(root):
+    """Iterate over the descendants of a node in document order.
+
+    The tree is traversed by the iterator of the element, which doesn't
+    use recursion, so deep trees don't reach the recursion limit.
+    """
+    return itertools.islice(root.iter(), 1, None)
+
+
+def _iter_text_nodes(root, node_filter):
+    """Iterate over the descendants of a node whose text can be translated,
+    yielding them along with the msgid of their text.
+    """
+    for node in _iter_descendants(root):
+        text = node.text
+        if (
+            not text or text[1:].startswith('wzxhzdk:') or
+            (node_filter is not None and not node_filter(node))
+        ):
+            continue
+        yield node, text.replace('\n', ' ')
+
+
+def _iter_title_nodes(root, node_filter):
+    """Iterate over the descendants of a node whose title can be
+    translated.
+    """
+    for node in _iter_descendants(root):
+        if (
+            'title' not in node.attrib or 'mdpo' in node.attrib or
+            (node_filter is not None and not node_filter(node))
+        ):
+            continue
+        yield node
+
+
+def _extensions_state(md):
+    """Get the per-document state of the extensions registered in a
+    Markdown instance, like the footnotes references found by the
+    footnotes extension, which is updated while the tree is processed.
+
+    The state is stored as copies of the containers of the extensions.
+    """
+    return [
+        (
+            extension,
+            {
+                name: copy.copy(value)
+                for name, value in vars(extension).items()
+                if isinstance(value, (dict, list, set))
+            },
+        ) for extension in md.registeredExtensions
+    ]
+
+
+def _restore_extensions_state(extensions_state):
+    for extension, attributes in extensions_state:
+        for name, value in attributes.items():
+            setattr(extension, name, copy.copy(value))
+
+
+def _translate_text_node(tr, node, msgid, compendium=None):
+    # translations of the compendium take precedence over the ones of the
+    # PO file of the page, as in the translation of the Markdown content
+    if compendium is not None:
+        for entry in compendium.msgid_entries.get(msgid, ()):
+            if entry.msgstr:
+                node.text = entry.msgstr
+                tr.translated_msgstrs.add(entry.msgstr)
+                return
+
+    for entry in _translation_entries(tr, msgid):
+        if entry.msgstr:
+            node.text = entry.msgstr
+            tr.translated_msgstrs.add(entry.msgstr)
+        entry.obsolete = False
+        tr.translated_msgids.add(entry.msgid)
+
+
 class MkdocsMdpoTreeProcessor(Treeprocessor):
     def run(self, root):
         mdpo_plugin = MkdocsBuild().mdpo_plugin
-        tr = mdpo_plugin.translations.current
+        translations = mdpo_plugin.translations
+        tr = translations.current
+        node_filter = mdpo_plugin.extensions.text_node_filter
         if tr is None:
+            # original page, store the tree if their translated pages
+            # are rendered from it (see `render_translated_tree`)
+            #
+            # if other Markdown contents are converted while the page is
+            # rendered (like docstrings by mkdocstrings), their HTML would
+            # not be translated, so the tree can't be used
+            if translations.pending_pages:
+                translations.original_tree = (
+                    (
+                        self.md,
+                        copy.deepcopy(root),
+                        _extensions_state(self.md),
+                    ) if translations.original_tree is None else False
+                )
+
+            # msgids of the texts, to check if their untranslated pages
+            # can be rendered from the rendered tree and to update the PO
+            # files of the languages excluded from the build
+            if (
+                translations.untranslated_pages or
+                translations.excluded_translations
+            ):
+                translations.original_msgids = (
+                    [
+                        msgid for _, msgid
+                        in _iter_text_nodes(root, node_filter)
+                    ] if translations.original_msgids is None else False
+                )
             return
 
-        def process_translation(node, msgid):
-            if msgid not in tr.translated_msgstrs:
-                if msgid in tr.po_msgids:
-                    for entry in tr.po:
-                        if entry.msgid == msgid:
-                            if entry.msgstr:
-                                node.text = entry.msgstr
-                                (
-                                    tr.translated_msgstrs
-                                ).append(
-                                    entry.msgstr,
-                                )
-                            entry.obsolete = False
-                            tr.translated_msgids.append(
-                                entry.msgid,
-                            )
-                elif msgid not in tr.disabled_msgids:
-                    tr.po_msgids.append(msgid)
-                    entry = polib.POEntry(msgid=msgid, msgstr='')
-                    tr.po.append(entry)
-
-        if 'pymdownx.tasklist' in mdpo_plugin.extensions.markdown:
-            node_should_be_processed = lambda node: False if (
-                node.tag == 'li' and node.text[:3] in ['[ ]', '[x]', '[X]']
-            ) else True
-
-            def iterate_childs(_root):
-                for child in _root:
-                    # print(child.tag, child.text, child.attrib)
-
-                    if (
-                        child.text
-                        and not child.text[1:].startswith('wzxhzdk:')
-                    ):
-                        if node_should_be_processed(child):
-                            process_translation(
-                                child,
-                                ' '.join(child.text.split('\n')),
-                            )
-
-                    iterate_childs(child)
-        else:
-            def iterate_childs(_root):
-                for child in _root:
-                    # print(child.tag, child.text, child.attrib)
-
-                    if (
-                        child.text
-                        and not child.text[1:].startswith('wzxhzdk:')
-                    ):
-                        process_translation(
-                            child,
-                            ' '.join(child.text.split('\n')),
-                        )
-
-                    iterate_childs(child)
-
-        iterate_childs(root)
+        for node, msgid in _iter_text_nodes(root, node_filter):
+            _translate_text_node(tr, node, msgid)
+
+
+class MkdocsMdpoRenderedTreeProcessor(Treeprocessor):
+    """Stores the tree of an original page rendered by Python-Markdown,
+    just before the relative paths of the page are resolved by Mkdocs.
+
+    It's used to render the pages without translations of the original
+    one (see :py:func:`render_untranslated_tree`).
+    """
+
+    def run(self, root):
+        translations = MkdocsBuild().mdpo_plugin.translations
+        if translations.current is None and translations.untranslated_pages:
+            # can't be used if other Markdown contents are converted while
+            # the page is rendered (see `MkdocsMdpoTreeProcessor`)
+            translations.rendered_tree = (
+                (
+                    self.md,
+                    copy.deepcopy(root),
+                    getattr(self.md, 'toc_tokens', []),
+                ) if translations.rendered_tree is None else False
+            )
 
 
 class MkdocsMdpoTitlesTreeProcessor(Treeprocessor):
+    """Translates ``title`` attributes of nodes.
+
+    Most of the nodes with titles are created by inline processors, which
+    run after :py:class:`MkdocsMdpoTreeProcessor`, so the titles can't be
+    collected walking the tree for texts and are processed at the end.
+    """
+
     def run(self, root):
         mdpo_plugin = MkdocsBuild().mdpo_plugin
 
-        tr = mdpo_plugin.translations.current
+        translations = mdpo_plugin.translations
+        tr = translations.current
+        node_filter = mdpo_plugin.extensions.title_node_filter
         if tr is None:
+            # titles of the original page, to update the PO files of the
+            # languages excluded from the build
+            if translations.excluded_translations:
+                translations.original_title_msgids = (
+                    [
+                        node.attrib['title'] for node
+                        in _iter_title_nodes(root, node_filter)
+                    ] if translations.original_title_msgids is None
+                    else False
+                )
             return
 
-        def process_translation(node, msgid):
-            if msgid not in tr.translated_msgstrs:
-                if msgid in tr.po_msgids:
-                    for entry in tr.po:
-                        if entry.msgid == msgid:
-                            if entry.msgstr:
-                                node.attrib['title'] = entry.msgstr
-                                (
-                                    tr.translated_msgstrs
-                                ).append(
-                                    entry.msgstr,
-                                )
-                            entry.obsolete = False
-                            tr.translated_msgids.append(
-                                entry.msgid,
-                            )
-                elif msgid not in tr.disabled_msgids:
-                    tr.po_msgids.append(msgid)
-                    entry = polib.POEntry(msgid=msgid, msgstr='')
-                    tr.po.append(entry)
-
-        if 'abbr' in mdpo_plugin.extensions.markdown:
-            if 'pymdownx.emoji' in mdpo_plugin.extensions.markdown:
-                node_should_be_processed = lambda node: (
-                    node.tag != 'abbr' and
-                    node.get('class') not in ['emojione', 'twemoji', 'gemoji']
-                )
-            else:
-                node_should_be_processed = lambda node: node.tag != 'abbr'
-        elif 'pymdownx.emoji' in mdpo_plugin.extensions.markdown:
-            node_should_be_processed = lambda node: (
-                node.get('class') not in ['emojione', 'twemoji', 'gemoji']
-            )
+        for node in _iter_title_nodes(root, node_filter):
+            for entry in _translation_entries(tr, node.attrib['title']):
+                if entry.msgstr:
+                    node.attrib['title'] = entry.msgstr
+                    tr.translated_msgstrs.add(entry.msgstr)
+                entry.obsolete = False
+                tr.translated_msgids.add(entry.msgid)
+
+
+def extensions_msgids(text_msgids, title_msgids, content_msgids):
+    """Get the msgids of an original page which are only handled by the tree
+    processors, not being extracted from its Markdown content.
+
+    The texts extracted from the content could be written differently in
+    the tree than in their msgids, like ``__bold__`` texts whose msgids are
+    ``**bold**``, so the messages of the texts not found between the
+    extracted ones are extracted too to identify them.
+
+    Args:
+        text_msgids (list): Msgids of the texts of the original page.
+        title_msgids (list): Msgids of the titles of the original page.
+        content_msgids (set): Msgids extracted from the Markdown content of
+            the original page.
+
+    Returns:
+        list: Msgids handled by the tree processors.
+    """
+    md2po_events = MkdocsBuild().mdpo_plugin.extensions.md2po_events
+
+    msgids = []
+    for msgid in text_msgids:
+        if msgid in content_msgids:
+            continue
+        entries = Md2Po(
+            msgid,
+            events=md2po_events,
+            mark_not_found_as_obsolete=False,
+            location=False,
+        ).extract()
+        if len(entries) == 1 and entries[0].msgid in content_msgids:
+            continue
+        msgids.append(msgid)
+    return msgids + title_msgids
+
+
+def collect_translation_msgids(tr, msgids):
+    """Update the PO file of a page which is not rendered with the msgids
+    handled by the tree processors in its original page (see
+    :py:func:`extensions_msgids`).
+
+    Args:
+        tr (Translation): Translation of the page.
+        msgids (list): Msgids handled by the tree processors or ``None`` if
+            they are not known, keeping the entries of the PO file.
+    """
+    if msgids is None:
+        tr.translated_msgids.update(tr.po.msgid_entries)
+        return
+
+    for msgid in msgids:
+        for entry in _translation_entries(tr, msgid):
+            entry.obsolete = False
+            tr.translated_msgids.add(entry.msgid)
+
+
+def render_translated_tree(
+        original_tree,
+        tr,
+        compendium,
+        required_msgids,
+        relpath,
+):
+    """Render a translated page from the tree of its original page.
+
+    Translates the texts of a copy of the tree, built by Python-Markdown
+    before inline processing (see :py:class:`MkdocsMdpoTreeProcessor`), and
+    runs the rest of the tree processors, the serializer and postprocessors
+    of the Markdown instance which rendered the original page. This avoids
+    to parse and render again the whole translated Markdown content.
+
+    Args:
+        original_tree (tuple): Markdown instance, tree of the original page
+            and state of its extensions when the tree was stored.
+        tr (Translation): Translation of the page.
+        compendium (IndexedPOFile): Compendium of the language of the page,
+            whose translations take precedence over the ones of the PO file
+            of the page.
+        required_msgids (set): Msgids translated in the Markdown content of
+            the page, which must be found in the tree.
+        relpath (:py:class:`markdown.treeprocessors.Treeprocessor`): Tree
+            processor which resolves relative paths for the translated
+            page, used instead of the one of the original page.
+
+    Returns:
+        tuple: HTML content and table of contents tokens of the page, or
+        ``None`` if the page can't be rendered from the tree of the
+        original page because some of the translated messages are not
+        found in it or some of its texts are not found in the PO file.
+    """
+    md, root, extensions_state = original_tree
+    root = copy.deepcopy(root)
 
+    mdpo_plugin = MkdocsBuild().mdpo_plugin
+    text_nodes = list(
+        _iter_text_nodes(root, mdpo_plugin.extensions.text_node_filter),
+    )
+    if not required_msgids.issubset(msgid for _, msgid in text_nodes):
+        return None
+    # texts not found in the PO file would be added to it as new messages
+    for _, msgid in text_nodes:
         if (
-            'abbr' in mdpo_plugin.extensions.markdown
-            or 'pymdownx.emoji' in mdpo_plugin.extensions.markdown
+            msgid not in tr.po.msgid_entries and
+            msgid not in tr.translated_msgstrs and
+            msgid not in tr.disabled_msgids
         ):
-            def iterate_childs(_root):
-                for child in _root:
-                    # print("TITLE", child.tag, child.text, child.attrib)
-
-                    if 'title' in child.attrib and 'mdpo' not in child.attrib:
-                        if node_should_be_processed(child):
-                            process_translation(
-                                child,
-                                child.attrib['title'],
-                            )
-                    iterate_childs(child)
-        else:
-            def iterate_childs(_root):
-                for child in _root:
-                    # print("TITLE", child.tag, child.text, child.attrib)
-
-                    if 'title' in child.attrib and 'mdpo' not in child.attrib:
-                        process_translation(
-                            child,
-                            child.attrib['title'],
-                        )
-                    iterate_childs(child)
-
-        iterate_childs(root)
+            return None
+
+    for node, msgid in text_nodes:
+        _translate_text_node(tr, node, msgid, compendium)
+
+    # the extensions must process the tree as they did for the original page
+    _restore_extensions_state(extensions_state)
+
+    return _render_tree_from(md, root, MkdocsMdpoTreeProcessor, relpath)
+
+
+def render_untranslated_tree(rendered_tree, tr, msgids, relpath):
+    """Render a page without translations from the rendered tree of its
+    original page.
+
+    The tree, stored by :py:class:`MkdocsMdpoRenderedTreeProcessor`, is
+    the same for both pages, so only the relative paths of the page are
+    resolved again and its titles translated, if needed. The texts of the
+    page are handled as :py:class:`MkdocsMdpoTreeProcessor` does.
+
+    Args:
+        rendered_tree (tuple): Markdown instance, rendered tree and table of
+            contents tokens of the original page.
+        tr (Translation): Translation of the page.
+        msgids (list): Msgids of the texts of the original page.
+        relpath (:py:class:`markdown.treeprocessors.Treeprocessor`): Tree
+            processor which resolves relative paths for the page.
+
+    Returns:
+        tuple: HTML content and table of contents tokens of the page, or
+        ``None`` if some of its texts are translated or not found in the
+        PO file.
+    """
+    # the PO file of excluded pages is not saved
+    if tr.po_filepath is not None:
+        for msgid in msgids:
+            if msgid in tr.translated_msgstrs:
+                continue
+            entries = tr.po.msgid_entries.get(msgid)
+            if entries is None:
+                if msgid not in tr.disabled_msgids:
+                    return None
+            elif any(entry.msgstr for entry in entries):
+                return None
+
+        for msgid in msgids:
+            for entry in _translation_entries(tr, msgid):
+                entry.obsolete = False
+                tr.translated_msgids.add(entry.msgid)
+
+    md, root, toc_tokens = rendered_tree
+    content, _ = _render_tree_from(
+        md,
+        copy.deepcopy(root),
+        MkdocsMdpoRenderedTreeProcessor,
+        relpath,
+    )
+    return content, toc_tokens
+
+
+def _render_tree_from(md, root, treeprocessor_class, relpath):
+    """Run the tree processors of a Markdown instance after the one of a
+    class, the serializer and the postprocessors over a tree.
+
+    Returns the HTML content and the table of contents tokens.
+    """
+    # run the tree processors after the passed one
+    original_relpath = (
+        md.treeprocessors['relpath'] if 'relpath' in md.treeprocessors
+        else None
+    )
+    treeprocessors = itertools.dropwhile(
+        lambda treeprocessor: not isinstance(
+            treeprocessor,
+            treeprocessor_class,
+        ),
+        md.treeprocessors,
+    )
+    next(treeprocessors, None)
+    for treeprocessor in treeprocessors:
+        if treeprocessor is original_relpath:
+            treeprocessor = relpath
+        new_root = treeprocessor.run(root)
+        if new_root is not None:
+            root = new_root
+
+    # serialize stripping top level tags and run postprocessors, as
+    # `markdown.Markdown.convert` does
+    output = md.serializer(root)
+    if md.stripTopLevelTags:
+        try:
+            start = output.index(f'<{md.doc_tag}>') + len(md.doc_tag) + 2
+            end = output.rindex(f'</{md.doc_tag}>')
+            output = output[start:end].strip()
+        except ValueError:
+            if output.strip().endswith(f'<{md.doc_tag} />'):
+                output = ''
+            else:
+                raise
+    for postprocessor in md.postprocessors:
+        output = postprocessor.run(output)
+    return output.strip(), getattr(md, 'toc_tokens', [])
 
 
 class MkdocsMdpoExtension(Extension):
     def extendMarkdown(self, md):
         # run first
         md.treeprocessors.register(
-            MkdocsMdpoTreeProcessor(self),
+            MkdocsMdpoTreeProcessor(md),
             'mkdocs-mdpo-tree',
             88888,
         )
 
+        # run just before Mkdocs resolves relative paths
+        md.treeprocessors.register(
+            MkdocsMdpoRenderedTreeProcessor(md),
+            'mkdocs-mdpo-tree-rendered',
+            0.1,
+        )
+
         # run latest
         md.treeprocessors.register(
-            MkdocsMdpoTitlesTreeProcessor(self),
+            MkdocsMdpoTitlesTreeProcessor(md),
             'mkdocs-mdpo-tree-titles',
             -88888,
         )
@@ -166,6 +473,10 @@ class Extensions:
     __slots__ = {
         'markdown',
         'md4c',
+        'md2po_events',
+        'po2md_events',
+        'text_node_filter',
+        'title_node_filter',
     }
 
     def __init__(self):
@@ -175,3 +486,13 @@ class Extensions:
         # md4c extensions used in mdpo translation (depend on Python-Markdown
         # configured extensions in `mkdocs.yml`)
         self.md4c = DEFAULT_MD4C_GENERIC_PARSER_EXTENSIONS
+
+        # mdpo events used extracting and translating pages (depend on
+        # Python-Markdown configured extensions, built on config event)
+        self.md2po_events = None
+        self.po2md_events = None
+
+        # filters of the nodes translated by the tree processors of the
+        # `mkdocs-mdpo` extension (built on config event)
+        self.text_node_filter = None
+        self.title_node_filter = None
@@ -1,6 +1,7 @@
 """Md4C parser preprocessing events for md2po instance."""
 
-import re  # noqa: F401
+import functools
+import re
 
 
 try:
@@ -30,6 +31,16 @@ except ImportError:  # pragma: no cover
     pass
 
 
+# regexes of the text blocks that md2po must not extract for each extension,
+# retrieved lazily because the extensions are optional
+MD2PO_TEXT_EVENT_EXTENSIONS_REGEXES = {
+    'admonition': lambda: AdmonitionProcessor.RE,
+    'pymdownx.details': lambda: DetailsProcessor.START,
+    'pymdownx.snippets': lambda: SnippetPreprocessor.RE_ALL_SNIPPETS,
+    'pymdownx.tabbed': lambda: TabbedProcessor.START,
+    'mkdocstrings': lambda: MkDocsStringsProcessor.regex,
+}
+
 PO2MD_EVENT_EXTENSIONS = {
     'link_reference': [
         'footnotes',
@@ -37,10 +48,43 @@ PO2MD_EVENT_EXTENSIONS = {
 }
 
 
+def _md2po_msgid_event(md2po_instance, msgid, *args):
+    if msgid.startswith(': '):
+        md2po_instance.disable_next_block = True
+
+
+def _md2po_link_reference_event(md2po_instance, target, *args):
+    if target.startswith('^'):
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def _build_md2po_events(text_event_extensions):
+    regexes = tuple(
+        re.compile(MD2PO_TEXT_EVENT_EXTENSIONS_REGEXES[extension]())
+        for extension in text_event_extensions
+    )
+
+    events = {}
+    if regexes:
+        def text_event(md2po_instance, block, text):
+            for regex in regexes:
+                if regex.match(text):
+                    md2po_instance.disabled_entries.append(text)
+                    return False
+
+        events['text'] = text_event
+    events['msgid'] = _md2po_msgid_event
+    events['link_reference'] = _md2po_link_reference_event
+    return events
+
+
 def build_md2po_events(markdown_extensions):
-    """Build dinamically those mdpo events executed at certain moments of the
-    Markdown file parsing extrating messages from pages, different depending on
+    """Build those mdpo events executed at certain moments of the Markdown
+    file parsing extrating messages from pages, different depending on
     active extensions and plugins.
+
+    The events are built only once for each set of extensions.
     """
     md_extensions = []
     for ext in markdown_extensions:
@@ -52,72 +96,27 @@ def build_md2po_events(markdown_extensions):
         else:
             md_extensions.append(ext)
 
-    def build_event(event_type):
-        parameters = {
-            'text': 'md2po_instance, block, text',
-            'msgid': 'md2po_instance, msgid, *args',
-            'link_reference': 'md2po_instance, target, *args',
-        }[event_type]
-
-        if event_type == 'text':
-            req_extension_conditions = {
-                'admonition': 're.match(AdmonitionProcessor.RE, text)',
-                'pymdownx.details': 're.match(DetailsProcessor.START, text)',
-                'pymdownx.snippets': (
-                    're.match(SnippetPreprocessor.RE_ALL_SNIPPETS, text)'
-                ),
-                'pymdownx.tabbed': 're.match(TabbedProcessor.START, text)',
-                'mkdocstrings': 're.match(MkDocsStringsProcessor.regex, text)',
-            }
-
-            body = ''
-            for req_extension, condition in req_extension_conditions.items():
-                if req_extension in md_extensions:
-                    body += (
-                        f'    if {condition}:\n        '
-                        'md2po_instance.disabled_entries.append(text)\n'
-                        '        return False\n'
-                    )
-            if not body:
-                return None
-        elif event_type == 'msgid':
-            body = (
-                "    if msgid.startswith(': '):"
-                'md2po_instance.disable_next_block = True\n'
-            )
-        else:  # link_reference
-            body = "    if target.startswith('^'):return False;\n"
-
-        function_definition = f'def {event_type}_event({parameters}):\n{body}'
-        code = compile(function_definition, 'test', 'exec')
-        exec(code)
-        return locals()[f'{event_type}_event']
-
     # load only those events required for the extensions
-    events_functions = {
-        event:
-        build_event(event) for event in ['text', 'msgid', 'link_reference']
-    }
+    return _build_md2po_events(
+        tuple(
+            extension for extension in MD2PO_TEXT_EVENT_EXTENSIONS_REGEXES
+            if extension in md_extensions
+        ),
+    )
 
-    events = {}
-    for event_name, event_function in events_functions.items():
-        if event_function is not None:
-            events[event_name] = event_function
 
-    return events
+def _po2md_link_reference_event(po2md_instance, target, href, title):
+    # footnotes
+    if target.startswith('^'):
+        # footnotes are treated as text blocks, so we don't need to
+        # translate them here
+        return False
 
 
 def build_po2md_events(markdown_extensions):
-    def link_reference_event(po2md_instance, target, href, title):
-        # footnotes
-        if target.startswith('^'):
-            # footnotes are treated as text blocks, so we don't need to
-            # translate them here
-            return False
-
     # load only those events required for the extensions
     events_functions = {
-        'link_reference': link_reference_event,
+        'link_reference': _po2md_link_reference_event,
     }
 
     events = {}
@@ -1,8 +1,15 @@
 """mdpo utilities"""
 
+import os
 import re
+import shutil
 
+import md4c
 from mdpo.command import COMMAND_SEARCH_REGEX
+from mdpo.po import pofiles_to_unique_translations_dicts
+from mdpo.po2md import Po2Md
+
+from mkdocs_mdpo_plugin.utils import text_file_has_content
 
 
 STRIP_COMMAND_REGEX = re.compile(r'[^\\]' + COMMAND_SEARCH_REGEX)
@@ -35,3 +42,143 @@ def remove_mdpo_setting_tags_from_po_entry(entry):
     for flag in MDPO_SETTINGS_TAGS:
         while flag in entry.flags:
             entry.flags.remove(flag)
+
+
+def po2md_from_pofiles(pofiles, **kwargs):
+    """Build a :py:class:`mdpo.po2md.Po2Md` translator which uses PO files
+    already loaded in memory instead of reading them from disk.
+
+    Args:
+        pofiles (list): :py:class:`polib.POFile` objects. Translations of
+            latest files take precedence over previous ones.
+        **kwargs: Optional arguments passed to :py:class:`mdpo.po2md.Po2Md`.
+    """
+    po2md = Po2Md([], **kwargs)
+    po2md.pofiles = pofiles
+    return po2md
+
+
+def parse_md4c_events(content, extensions):
+    """Parse a Markdown content with md4c recording the events triggered by
+    the parser, so they can be replayed for multiple translations without
+    parsing the content again.
+
+    Args:
+        content (str): Markdown content to parse.
+        extensions (list): md4c extensions enabled in the parser.
+
+    Returns:
+        list: Tuples of callback index (enter block, leave block, enter
+        span, leave span and text) and arguments passed to the callback.
+    """
+    events = []
+    parser = md4c.GenericParser(
+        0,
+        **{ext: True for ext in extensions},
+    )
+    parser.parse(
+        content,
+        lambda *args: events.append((0, args)),
+        lambda *args: events.append((1, args)),
+        lambda *args: events.append((2, args)),
+        lambda *args: events.append((3, args)),
+        lambda *args: events.append((4, args)),
+    )
+    return events
+
+
+def translate_md4c_events(po2md, content, md4c_events):
+    """Translate a Markdown content replaying md4c events previously
+    recorded by :py:func:`parse_md4c_events`.
+
+    Does the same as :py:meth:`mdpo.po2md.Po2Md.translate`, but without
+    parsing the content.
+
+    Args:
+        po2md (:py:class:`mdpo.po2md.Po2Md`): Translator.
+        content (str): Markdown content from which the events were recorded.
+        md4c_events (list): Recorded md4c events.
+
+    Returns:
+        str: Translated content.
+    """
+    po2md.content = content
+    po2md.translations, po2md.translations_with_msgctxt = (
+        pofiles_to_unique_translations_dicts(po2md.pofiles)
+    )
+
+    callbacks = (
+        po2md.enter_block,
+        po2md.leave_block,
+        po2md.enter_span,
+        po2md.leave_span,
+        po2md.text,
+    )
+    for callback_index, args in md4c_events:
+        callbacks[callback_index](*args)
+    po2md._append_link_references()  # add link references to the end
+
+    po2md.disable_next_block = False
+    po2md.disable = False
+    po2md.enable_next_block = False
+    po2md.link_references = None
+
+    po2md.output = '\n'.join(po2md.outputlines)
+    return po2md.output
+
+
+def md4c_events_block_structure(md4c_events):
+    """Get the block structure of a Markdown content from its recorded md4c
+    events.
+
+    HTML blocks are ignored because po2md doesn't include HTML comments in
+    the translated content, and only the level of headings is taken from
+    the details of the blocks.
+
+    Args:
+        md4c_events (list): md4c events recorded by
+            :py:func:`parse_md4c_events`.
+
+    Returns:
+        list: Tuples of callback index (enter or leave block), block type
+        and heading level.
+    """
+    structure = []
+    for callback_index, args in md4c_events:
+        if callback_index > 1:
+            continue
+        block, details = args
+        if block is not md4c.BlockType.HTML:
+            structure.append((callback_index, block, details.get('level')))
+    return structure
+
+
+def save_pofile(pofile, fpath):
+    """Save a PO file atomically.
+
+    The content is written to a temporal file in the same directory which
+    replaces the destination file at the end, so the previous file is
+    preserved if the writing fails.
+
+    The file is not written if its content has not changed.
+
+    Args:
+        pofile (:py:class:`polib.POFile`): PO file to save.
+        fpath (str): Path to the destination file.
+    """
+    content = str(pofile)
+    if text_file_has_content(fpath, content, encoding=pofile.encoding):
+        return
+
+    dirpath, filename = os.path.split(os.path.abspath(fpath))
+    temp_fpath = os.path.join(dirpath, f'.{filename}.mdpo-tmp')
+    try:
+        with open(temp_fpath, 'w', encoding=pofile.encoding) as f:
+            f.write(content)
+        if os.path.isfile(fpath):
+            shutil.copymode(fpath, temp_fpath)
+        os.replace(temp_fpath, fpath)
+    except BaseException:
+        if os.path.isfile(temp_fpath):
+            os.remove(temp_fpath)
+        raise
@@ -12,6 +12,10 @@ MKDOCS_MINOR_VERSION_INFO = tuple(
     int(n) for n in mkdocs.__version__.split('.')[:2]
 )
 
+LUNR_LANGUAGES_DIRPATH = os.path.join(
+    mkdocs.__path__[0], 'contrib', 'search', 'lunr-language',
+)
+
 
 class MkdocsBuild:
     """Represents the Mkdocs build process.
@@ -61,12 +65,8 @@ def set_on_build_error_event(MdpoPlugin):
 
 @functools.lru_cache(maxsize=None)
 def get_lunr_languages():
-    languages_dirpath = os.path.join(
-        mkdocs.__path__[0], 'contrib', 'search', 'lunr-language',
-    )
-
     languages = []
-    for filename in os.listdir(languages_dirpath):
+    for filename in os.listdir(LUNR_LANGUAGES_DIRPATH):
         lang = filename.split('.')[1]
         if len(lang) == 2:
             languages.append(lang)
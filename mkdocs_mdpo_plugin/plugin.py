@@ -1,5 +1,6 @@
 """mkdocs-mdpo-plugin module"""
 
+import copy
 import functools
 import logging
 import math
@@ -8,31 +9,42 @@ import re
 import sys
 from urllib.parse import urljoin
 
-import jinja2
 import mkdocs
 import polib
 from mdpo.md2po import Md2Po
-from mdpo.po2md import Po2Md
 
 from mkdocs_mdpo_plugin.config import CONFIG_SCHEME, on_config_event
-from mkdocs_mdpo_plugin.extensions import Extensions
-from mkdocs_mdpo_plugin.mdpo_events import (
-    build_md2po_events,
-    build_po2md_events,
+from mkdocs_mdpo_plugin.extensions import (
+    Extensions,
+    collect_translation_msgids,
+    extensions_msgids,
+    render_translated_tree,
+    render_untranslated_tree,
 )
 from mkdocs_mdpo_plugin.mdpo_utils import (
+    md4c_events_block_structure,
+    parse_md4c_events,
+    po2md_from_pofiles,
     remove_mdpo_commands_preserving_escaped,
     remove_mdpo_setting_tags_from_po_entry,
+    translate_md4c_events,
 )
 from mkdocs_mdpo_plugin.mkdocs_utils import (
     MkdocsBuild,
     get_lunr_languages,
     set_on_build_error_event,
 )
-from mkdocs_mdpo_plugin.search_indexes import TranslationsSearchPatcher
-from mkdocs_mdpo_plugin.translations import Translation, Translations
+from mkdocs_mdpo_plugin.search_indexes import (
+    TranslationsSearchPatcher,
+    get_search_plugin_index_json,
+)
+from mkdocs_mdpo_plugin.translations import (
+    IndexedPOFile,
+    Translation,
+    Translations,
+)
 from mkdocs_mdpo_plugin.utils import (
-    po_messages_stats,
+    build_dest_filename_renderer,
     readable_float,
     removepreffix,
     removesuffix,
@@ -41,6 +53,8 @@ from mkdocs_mdpo_plugin.utils import (
 
 logger = logging.getLogger('mkdocs.plugins.mdpo')
 
+META_DESCRIPTION_RE = re.compile(r'<meta name="description" content="[^"]*"')
+
 
 class MdpoPlugin(mkdocs.plugins.BasePlugin):
     config_scheme = CONFIG_SCHEME
@@ -74,6 +88,398 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
             self.config['lc_messages'],
         )
 
+    def _translate_config_settings(self, language, compendium_pofile, config):
+        """Translate the configuration settings defined in ``translate``.
+
+        Settings are the same for all the pages, so they are resolved
+        from the compendium only the first time that are needed for each
+        language.
+
+        Returns:
+            dict: Translations of the settings, ``None`` for settings
+            not found in the compendium.
+        """
+        if language not in self.translations.config_settings:
+            translated_config_settings = {}
+            for setting in self.config['translate']:
+                entries = compendium_pofile.msgid_entries.get(config[setting])
+                if entries:
+                    for entry in entries:
+                        # matching translated setting found
+                        entry.obsolete = False
+                        translated_config_settings[setting] = entry.msgstr
+                        if f'mdpo-{setting}' not in entry.flags:
+                            entry.flags.append(f'mdpo-{setting}')
+                else:
+                    # add translatable configuration setting to compendium
+                    translated_config_settings[setting] = None
+                    compendium_pofile.insert(
+                        0,
+                        polib.POEntry(
+                            msgid=config[setting],
+                            msgstr='',
+                            flags=[f'mdpo-{setting}'],
+                        ),
+                    )
+            self.translations.config_settings[language] = (
+                translated_config_settings
+            )
+        return self.translations.config_settings[language]
+
+    def _populate_translated_page(self, page, config, files, render_tree=None):
+        """Read and render a translated page.
+
+        If ``render_tree`` is passed, it's called with the tree processor
+        which resolves the relative paths of the page to render it from the
+        tree of the original page, returning the HTML content and the table
+        of contents tokens of the page, or ``None`` if its Markdown content
+        must be rendered instead.
+        """
+        dirty = (
+            '--dirty' in sys.argv and
+            '-c' not in sys.argv and '--clean' not in sys.argv
+        )
+        if render_tree is None:
+            return mkdocs.commands.build._populate_page(
+                page,
+                config,
+                files,
+                dirty=dirty,
+            )
+
+        # same as `mkdocs.commands.build._populate_page`, but rendering
+        # the page from the tree of the original one
+        if dirty and not page.file.is_modified():
+            return
+
+        page = config['plugins'].run_event(
+            'pre_page', page, config=config, files=files,
+        )
+        page.read_source(config)
+        markdown = page.markdown
+        page.markdown = config['plugins'].run_event(
+            'page_markdown', page.markdown, page=page, config=config,
+            files=files,
+        )
+
+        rendered = None
+        if page.markdown == markdown:
+            rendered = render_tree(
+                mkdocs.structure.pages._RelativePathTreeprocessor(
+                    page.file,
+                    files,
+                ),
+            )
+        if rendered is None:
+            page.render(config, files)
+        else:
+            page.content, toc_tokens = rendered
+            page.toc = mkdocs.structure.toc.get_toc(toc_tokens)
+
+        page.content = config['plugins'].run_event(
+            'page_content', page.content, page=page, config=config,
+            files=files,
+        )
+
+    def _translated_config(self, language, config):
+        """Get the configuration used to render the pages of a language,
+        which includes the translations of its config settings.
+
+        It's a copy of the Mkdocs configuration, created only once per
+        language, or the configuration itself if none of the settings
+        are translated.
+        """
+        if language not in self.translations.configs:
+            translated_settings = {
+                setting: msgstr for setting, msgstr in (
+                    self.translations.config_settings.get(
+                        language,
+                        {},
+                    ).items()
+                ) if msgstr
+            }
+            if translated_settings:
+                translated_config = copy.copy(config)
+                translated_config.data = {
+                    **config.data,
+                    **translated_settings,
+                }
+            else:
+                translated_config = config
+            self.translations.configs[language] = translated_config
+        return self.translations.configs[language]
+
+    def _translate_section_title(self, title, language):
+        """Translate the title of a navigation section using the compendium
+        of a language, adding it to the compendium if is not included.
+        """
+        compendium_pofile = self.translations.compendiums[language]
+        entries = compendium_pofile.msgid_entries.get(title)
+        if entries:
+            entry = entries[0]
+            entry.obsolete = False
+            if entry.msgstr:
+                self.translations.compendium_msgstrs_tr[language].add(
+                    entry.msgstr,
+                )
+                title = entry.msgstr
+        elif title not in self.translations.compendium_msgids[language]:
+            compendium_pofile.insert(
+                0,
+                polib.POEntry(msgid=title, msgstr=''),
+            )
+        self.translations.compendium_msgids[language].add(title)
+        return title
+
+    def _translate_nav(self, nav, language):
+        """Build the navigation of a language.
+
+        The sections of the navigation are copied translating their titles,
+        so the original navigation is not modified, and the pages are
+        replaced by their translated pages.
+        """
+        def _translate_items(items, parent):
+            translated_items = []
+            for item in items:
+                if isinstance(item, mkdocs.structure.nav.Section):
+                    translated_item = copy.copy(item)
+                    if item.title:
+                        translated_item.title = self._translate_section_title(
+                            item.title,
+                            language,
+                        )
+                    translated_item.children = _translate_items(
+                        item.children,
+                        translated_item,
+                    )
+                elif item.is_page:
+                    translated_file = getattr(
+                        item.file,
+                        '_mdpo_languages',
+                        {},
+                    ).get(language)
+                    if translated_file is None:
+                        translated_item = copy.copy(item)
+                    else:
+                        translated_item = translated_file.page
+                    translated_pages.append(translated_item)
+                    if item is nav.homepage:
+                        translated_nav.homepage = translated_item
+                else:
+                    translated_item = copy.copy(item)
+                translated_item.parent = parent
+                translated_items.append(translated_item)
+            return translated_items
+
+        translated_pages = []
+        translated_nav = mkdocs.structure.nav.Navigation([], translated_pages)
+        translated_nav.items = _translate_items(nav.items, None)
+
+        for i, page in enumerate(translated_pages):
+            page.previous_page = translated_pages[i - 1] if i else None
+            page.next_page = (
+                translated_pages[i + 1] if i + 1 < len(translated_pages)
+                else None
+            )
+        return translated_nav
+
+    def _search_patcher(self, config):
+        if self.config['cross_language_search']:
+            return None
+        if self.translations.search_patcher is None:
+            # static files are copied to the site directory before
+            # any HTML file is written, so the patcher can find the
+            # worker files of the theme
+            self.translations.search_patcher = TranslationsSearchPatcher(
+                config['site_dir'],
+                self.config['languages'],
+                self.config['default_language'],
+                # use mkdocs 'search' plugin if the theme
+                # has not its own implementation
+                (
+                    config['theme'].name
+                    if config['theme'].name
+                    in TranslationsSearchPatcher.supported_themes
+                    else 'mkdocs'
+                ),
+                self.translations.locations,
+                shared_search_index=self.config['shared_search_index'],
+                search_index_shard_size=self.config['search_index_shard_size'],
+            )
+        return self.translations.search_patcher
+
+    def _load_compendium(self, lang_docs_dir, language):
+        """Get the compendium of a language, loading it to memory the first
+        time is needed. It will be saved at the end of the build.
+        """
+        if language not in self.translations.compendiums:
+            compendium_filepath = os.path.join(
+                lang_docs_dir,
+                '_compendium.po',
+            )
+            if os.path.isfile(compendium_filepath):
+                compendium_pofile = polib.pofile(
+                    compendium_filepath,
+                    klass=IndexedPOFile,
+                )
+            else:
+                compendium_pofile = IndexedPOFile(
+                    fpath=compendium_filepath,
+                )
+            self.translations.compendiums[language] = compendium_pofile
+
+            # intialize compendium messages cache
+            self.translations.compendium_msgstrs_tr[language] = set()
+            self.translations.compendium_msgids[language] = set()
+        return self.translations.compendiums[language]
+
+    def _load_pofile(self, po_filepath):
+        """Load the PO file of a page, which could have been loaded before
+        to compute the messages statistics of its language.
+        """
+        po = self.translations.pofiles.pop(po_filepath, None)
+        if po is None:
+            if os.path.isfile(po_filepath):
+                po = polib.pofile(po_filepath, klass=IndexedPOFile)
+            else:
+                po = IndexedPOFile()
+        return po
+
+    def _extract_page_messages(self, page, config):
+        """Extract the messages of the Markdown source of a page before it is
+        read by Mkdocs.
+
+        The extracted PO file is stored to be reused when the page is
+        translated, if its Markdown content is not changed by other plugins
+        (see `on_page_markdown` event).
+
+        Returns:
+            list: Msgids of the title, description and content of the page.
+        """
+        with open(page.file.abs_src_path, encoding='utf-8-sig') as f:
+            markdown, meta = mkdocs.utils.meta.get_data(f.read())
+
+        # the title is computed as Mkdocs does when the page is read
+        titled_page = copy.copy(page)
+        titled_page.markdown, titled_page.meta = (markdown, meta)
+        titled_page._set_title()
+        msgids = [titled_page.title]
+        if meta.get('description'):
+            msgids.append(meta['description'])
+
+        md2po = Md2Po(
+            markdown,
+            events=self.extensions.md2po_events,
+            mark_not_found_as_obsolete=False,
+            location=False,
+            ignore_msgids=self.config['ignore_msgids'],
+        )
+        original_po = md2po.extract()
+        self.translations.original_pofiles[page.file.src_path] = (
+            markdown,
+            md2po,
+            original_po,
+        )
+        msgids.extend(entry.msgid for entry in original_po)
+        return msgids
+
+    def _exclude_languages_below_min_translated(self, config, files):
+        """Exclude from the build the languages without the minimum number of
+        translated messages defined by ``min_translated_messages``.
+
+        The statistics are computed from the PO files of the pages and the
+        compendium of each language, before any page is rendered, counting
+        as untranslated the messages of the pages not included in them. The
+        PO files loaded are reused when the pages are translated.
+        """
+        pages_msgids = {
+            file.src_path: self._extract_page_messages(file.page, config)
+            for file in files.documentation_pages()
+            if file.src_path not in self.config['exclude']
+        }
+
+        min_translated = self.config['min_translated_messages']
+        for language in self._translation_languages():
+            lang_docs_dir = self._language_dir(config['docs_dir'], language)
+
+            stats = {'total': 0, 'translated': 0}
+            compendium_pofile = self._load_compendium(lang_docs_dir, language)
+            compendium_pofile.track_stats(stats)
+            for src_path, msgids in pages_msgids.items():
+                po_filepath = os.path.join(lang_docs_dir, f'{src_path}.po')
+                if os.path.isfile(po_filepath):
+                    po = polib.pofile(po_filepath, klass=IndexedPOFile)
+                    self.translations.pofiles[po_filepath] = po
+                    po.track_stats(stats)
+                else:
+                    po = IndexedPOFile()
+
+                # new messages of the page
+                stats['total'] += len({
+                    msgid for msgid in msgids
+                    if msgid not in po.msgid_entries and
+                    msgid not in compendium_pofile.msgid_entries
+                })
+
+            self.translations.stats[language] = stats
+            if not self._min_translated_reached(
+                language,
+                stats,
+                min_translated,
+            ):
+                self.translations.excluded_languages.append(language)
+
+        # languages have been removed from the 'languages' setting
+        self._translation_languages.cache_clear()
+
+    def _min_translated_reached(self, language, stats, min_translated):
+        """Check if a language has the minimum number of translated messages
+        defined by ``min_translated_messages``, excluding it from the build
+        if not.
+        """
+        if abs(min_translated) != min_translated:  # percent
+            min_translated = abs(min_translated)
+            percent_translated = (
+                stats['translated'] / stats['total'] * 100
+                if stats['total'] else 0
+            )
+            if percent_translated < min_translated:
+                logger.info(
+                    '[mdpo] '
+                    f'Excluding language "{language}". Translated'
+                    f' {readable_float(percent_translated)}%'
+                    f' ({stats["translated"]} of'
+                    f' {stats["total"]} messages) but'
+                    f' required {readable_float(min_translated)}%'
+                    ' at least.\n',
+                )
+                self.config['languages'].remove(language)
+                return False
+        elif stats['translated'] < min_translated:
+            # without messages if the PO files of the language are not
+            # created yet
+            if min_translated > stats['total'] and stats['total']:
+                logger.warning(
+                    '[mdpo] Found more required translated'
+                    f' messages ({min_translated}) than total of'
+                    f' them ({stats["total"]}). Using'
+                    f' {stats["total"]} for'
+                    ' "min_translated_messages" value.',
+                )
+                min_translated = stats['total']
+
+            logger.info(
+                '[mdpo] '
+                f'Excluding language "{language}".'
+                f' Translated {stats["translated"]} messages'
+                f' of {stats["total"]} but required'
+                f' {min_translated} translated'
+                ' messages at least.\n',
+            )
+            self.config['languages'].remove(language)
+            return False
+        return True
+
     on_config = on_config_event
 
     def on_pre_build(self, config):
@@ -95,6 +501,10 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
         new_files = mkdocs.structure.files.Files([])
 
         ignore_extensions = self.config['ignore_extensions']
+        render_dest_path = build_dest_filename_renderer(
+            self.config['dest_filename_template'],
+            self.config,
+        )
         for file in files:
             # exclude all files with PO related extensions
             if os.path.splitext(file.src_path)[-1] not in ignore_extensions:
@@ -105,11 +515,7 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
 
                 for language in self._translation_languages():
                     # render destination path
-                    context = {'file': file, 'language': language}
-                    context.update(self.config)
-                    dest_path = jinja2.Template(
-                        self.config['dest_filename_template'],
-                    ).render(**context)
+                    dest_path = render_dest_path(file, language)
                     src_path = f"{removesuffix(dest_path, '.html')}.md"
 
                     self.translations.files[file.src_path][language] = (
@@ -118,8 +524,18 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
                             src_path,
                         )
                     )
+
         return new_files
 
+    def on_nav(self, nav, config, files):
+        # languages that will not be included are known before rendering
+        if self.config['min_translated_messages']:
+            self._exclude_languages_below_min_translated(config, files)
+
+    def on_page_read_source(self, page, config):
+        """Read the content of translated files kept in memory."""
+        return getattr(page.file, '_mdpo_content', None)
+
     def on_page_context(self, context, page, config, nav):
         """Navigation translation."""
         if not hasattr(page.file, '_mdpo_language'):
@@ -131,68 +547,18 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
         if context['config']['theme'].name == 'material':
             context['config']['theme']['language'] = language
 
-        def _translate_section_title(section):
-            if section.title and section.title not in \
-                    self.translations.compendium_msgids[language]:
-                compendium_filepath = self.translations.compendium_files[
-                    language
-                ]
-                compendium_pofile = polib.pofile(compendium_filepath)
-
-                _section_title_in_compendium = False
-                for entry in compendium_pofile:
-                    if entry.msgid == section.title:
-                        _section_title_in_compendium = True
-                        entry.obsolete = False
-                        if entry.msgstr:
-                            section.title = entry.msgstr
-                            self.translations.compendium_msgstrs_tr[
-                                language
-                            ].append(
-                                entry.msgstr,
-                            )
-                        break
-                if not _section_title_in_compendium:
-                    compendium_pofile.insert(
-                        0,
-                        polib.POEntry(
-                            msgid=section.title,
-                            msgstr='',
-                        ),
-                    )
-                    compendium_pofile.save(compendium_filepath)
-                self.translations.compendium_msgids[language].append(
-                    section.title,
-                )
-
-        def _translate_nav_section(items):
-            for item in items:
-                if isinstance(item, mkdocs.structure.nav.Section):
-                    _translate_section_title(item)
-
-                    if item.children:
-                        _translate_nav_section(item.children)
-
-                if (
-                    item.title not in self.translations.nav or
-                    language not in self.translations.nav[item.title]
-                ):
-                    # language not added because page has been excluded
-                    # from translations
-                    continue
-
-                tr_title, tr_url = self.translations.nav[
-                    item.title
-                ][language]
-
-                if tr_title:
-                    item.title = tr_title
-                if item.is_page:
-                    item.file.url = tr_url
+        # translated config settings are rendered by the theme
+        context['config'] = self._translated_config(language, config)
 
-        # recursively translate navigation sections
-        # (pages titles and section titles)
-        _translate_nav_section(nav.items)
+        # the navigation of each language is built only once, for the
+        # first page of the language rendered
+        if language not in self.translations.navs:
+            self.translations.navs[language] = self._translate_nav(
+                nav,
+                language,
+            )
+        context['nav'] = self.translations.navs[language]
+        return context
 
     def on_page_markdown(self, markdown, page, config, files):
         """Event executed when markdown content of a page is collected.
@@ -209,9 +575,6 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
         if hasattr(page.file, '_mdpo_language'):
             return
 
-        # get minimum translation requirements
-        min_translated = self.config['min_translated_messages']
-
         # check if the file is excluded to be translated
         #
         # the implementation here opts for create the file but
@@ -222,29 +585,37 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
         # will do cross language linking, which worsens the user experience
         excluded_page = page.file.src_path in self.config['exclude']
 
-        # navigation pages titles translations and new pages urls are
-        # stored in dictionaries by language, so we can translate the
-        # titles in their own PO files and then change the URLs
-        # (see `on_page_context` event)
-        if page.title not in self.translations.nav:
-            # lang: [title, url]
-            self.translations.nav[page.title] = {}
-
-        # extract translations from original Markdown file
-        md2po = Md2Po(
-            markdown,
-            events=build_md2po_events(self.extensions.markdown),
-            mark_not_found_as_obsolete=False,
-            location=False,
-            ignore_msgids=self.config['ignore_msgids'],
+        # extract translations from original Markdown file, if they have not
+        # been extracted before from its source
+        original_markdown, md2po, original_po = (
+            self.translations.original_pofiles.pop(
+                page.file.src_path,
+                (None, None, None),
+            )
         )
-        original_po = md2po.extract()
-
-        po2md_events = build_po2md_events(self.extensions.markdown)
+        if markdown != original_markdown:
+            md2po = Md2Po(
+                markdown,
+                events=self.extensions.md2po_events,
+                mark_not_found_as_obsolete=False,
+                location=False,
+                ignore_msgids=self.config['ignore_msgids'],
+            )
+            original_po = md2po.extract()
 
         _mdpo_languages = {}  # {lang: file}
 
-        for language in self._translation_languages():
+        # md4c events of the page, recorded parsing it for the first language
+        md4c_events, original_structure = (None, None)
+
+        for language in (
+            self._translation_languages() +
+            self.translations.excluded_languages
+        ):
+            # msgids required to render the page from the tree of the
+            # original one, `None` if it must be rendered from its content
+            _required_msgids = None
+
             if not excluded_page:
                 # if the page has been excluded from being translated
                 lang_docs_dir = self._language_dir(
@@ -252,25 +623,11 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
                     language,
                 )
 
-                compendium_filepath = os.path.join(
+                compendium_pofile = self._load_compendium(
                     lang_docs_dir,
-                    '_compendium.po',
+                    language,
                 )
 
-                # create compendium if doesn't exists, load to memory
-                if language not in self.translations.compendium_files:
-                    if not os.path.isfile(compendium_filepath):
-                        compendium_pofile = polib.POFile()
-                        compendium_pofile.save(compendium_filepath)
-                    self.translations.compendium_files[language] = \
-                        compendium_filepath
-
-                    # intialize compendium messages cache
-                    self.translations.compendium_msgstrs_tr[language] = []
-                    self.translations.compendium_msgids[language] = []
-
-                compendium_pofile = polib.pofile(compendium_filepath)
-
                 # create pofile of the page for each language
                 po_filepath = os.path.join(
                     lang_docs_dir,
@@ -280,58 +637,31 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
                     os.path.abspath(os.path.dirname(po_filepath)),
                     exist_ok=True,
                 )
-                if not os.path.isfile(po_filepath):
-                    po = polib.POFile()
-                else:
-                    po = polib.pofile(po_filepath)
+                po = self._load_pofile(po_filepath)
 
-                for entry in original_po:
-                    if entry not in po:
-                        po.append(entry)
+                po.merge(original_po)
 
-                _translated_entries_msgids = []
-                _translated_entries_msgstrs = []
+                _translated_entries_msgids = set()
+                _translated_entries_msgstrs = set()
 
                 # translate metadata and config settings
                 #
-                # translate title
-                translated_page_title, _title_in_pofile = (None, False)
-                # translated custom description
+                # translate custom description
                 page_meta_description = page.meta.get('description')
-                translated_page_desc, _desc_in_pofile = (None, False)
-
-                # translate site_name and site_description
-                translated_config_settings = {
-                    key: None for key in self.config['translate']
-                }
-                _config_settings_in_pofile = {
-                    key: False for key in self.config['translate']
-                }
-
+                translated_page_desc = None
                 if page_meta_description:
-                    for entry in po:
-                        if entry.msgid == page.title:
-                            # matching title found
-                            entry.obsolete = False
-                            translated_page_title = entry.msgstr
-                            _title_in_pofile = True
-                            if entry.msgstr:
-                                _translated_entries_msgstrs.append(
-                                    entry.msgstr,
-                                )
-
-                        if entry.msgid == page_meta_description:
+                    desc_entries = po.msgid_entries.get(page_meta_description)
+                    if desc_entries:
+                        for entry in desc_entries:
                             # matching description found
                             entry.obsolete = False
                             translated_page_desc = entry.msgstr
-                            _desc_in_pofile = True
                             if entry.msgstr:
-                                _translated_entries_msgstrs.append(
+                                _translated_entries_msgstrs.add(
                                     page_meta_description,
                                 )
-
-                    # add description to PO file if not added
-                    if not _desc_in_pofile:
+                    else:
+                        # add description to PO file if not added
                         po.insert(
                             0,
                             polib.POEntry(
@@ -339,87 +669,91 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
                                 msgstr='',
                             ),
                         )
+                        _translated_entries_msgids.add(page_meta_description)
 
-                        _translated_entries_msgids.append(
-                            page_meta_description,
-                        )
+                # translate title (inserted before the description, if
+                # needed, so is placed at the top of the PO file)
+                translated_page_title = None
+                title_entries = po.msgid_entries.get(page.title)
+                if title_entries:
+                    for entry in title_entries:
+                        # matching title found
+                        entry.obsolete = False
+                        translated_page_title = entry.msgstr
+                        if entry.msgstr:
+                            _translated_entries_msgstrs.add(entry.msgstr)
                 else:
-                    for entry in po:
-                        if entry.msgid == page.title:
-                            # matching title found
-                            entry.obsolete = False
-                            translated_page_title = entry.msgstr
-                            _title_in_pofile = True
-                            if entry.msgstr:
-                                _translated_entries_msgstrs.append(
-                                    entry.msgstr,
-                                )
-
-                for entry in compendium_pofile:
-                    for setting in translated_config_settings:
-                        if entry.msgid == config[setting]:
-                            # matching translated setting found
-                            entry.obsolete = False
-                            translated_config_settings[setting] = entry.msgstr
-                            _config_settings_in_pofile[setting] = True
-                            _translated_entries_msgids.append(config[setting])
-                            if entry.msgstr:
-                                _translated_entries_msgstrs.append(
-                                    entry.msgstr,
-                                )
-                            if f'mdpo-{setting}' not in entry.flags:
-                                entry.flags.append(f'mdpo-{setting}')
-
-                # add title to PO file if not added
-                if not _title_in_pofile:
+                    # add title to PO file if not added
                     po.insert(
                         0,
                         polib.POEntry(msgid=page.title, msgstr=''),
                     )
-                    _translated_entries_msgids.append(page.title)
+                    _translated_entries_msgids.add(page.title)
 
-                # add translatable configuration settings to PO file
-                for setting, _translated in _config_settings_in_pofile.items():
-                    if not _translated:
-                        compendium_pofile.insert(
-                            0,
-                            polib.POEntry(
-                                msgid=config[setting],
-                                msgstr='',
-                                flags=[f'mdpo-{setting}'],
-                            ),
-                        )
-                compendium_pofile.save(compendium_filepath)
+                # translate site_name and site_description
+                translated_config_settings = self._translate_config_settings(
+                    language,
+                    compendium_pofile,
+                    config,
+                )
+                for setting, msgstr in translated_config_settings.items():
+                    _translated_entries_msgids.add(config[setting])
+                    if msgstr:
+                        _translated_entries_msgstrs.add(msgstr)
 
                 # add temporally compendium entries to language pofiles
-                for entry in compendium_pofile:
-                    if entry not in po and entry.msgstr:
-                        po.append(entry)
-                po.save(po_filepath)
-
-                # if a minimum number of translations are required to include
-                # the file, compute number of untranslated messages
-                if min_translated:
-                    n_translated, n_total = po_messages_stats(po)
-                    if language not in self.translations.stats:
-                        self.translations.stats[language] = {
-                            'total': n_total,
-                            'translated': n_translated,
-                        }
-                    else:
-                        self.translations.stats[language][
-                            'total'
-                        ] += n_total
-                        self.translations.stats[language][
-                            'translated'
-                        ] += n_translated
+                #
+                # entries are copied because the compendium is shared
+                # between all the pages of the language
+                po.merge(
+                    (entry for entry in compendium_pofile if entry.msgstr),
+                    copy_entries=True,
+                )
+
+                # languages without the minimum number of translated messages
+                # keep their PO files updated with the messages of the page,
+                # but the page is not translated nor rendered
+                if language in self.translations.excluded_languages:
+                    # the text events of the extensions disable raw texts
+                    _disabled_msgids = {
+                        getattr(entry, 'msgid', entry)
+                        for entry in md2po.disabled_entries
+                    }
+                    _disabled_msgids.update(self.config['ignore_msgids'])
+                    _translated_entries_msgids.add(page.title)
+                    if page_meta_description:
+                        _translated_entries_msgids.add(page_meta_description)
+                    _translated_entries_msgids.update(
+                        entry.msgid for entry in original_po
+                    )
+                    translation = Translation(
+                        language,
+                        po,
+                        po_filepath,
+                        _translated_entries_msgstrs,
+                        _translated_entries_msgids,
+                        _disabled_msgids,
+                    )
+                    if language not in self.translations.all:
+                        self.translations.all[language] = []
+                    self.translations.all[language].append(translation)
+
+                    # msgids handled by the extensions are collected after
+                    # the original page is rendered (see `on_page_content`)
+                    self.translations.excluded_translations.append(
+                        translation,
+                    )
+                    continue
 
                 # translate part of the markdown producing a translated file
                 # content (the rest of the translations are handled by
                 # extensions, see `extension` module)
-                po2md = Po2Md(
-                    [po_filepath, compendium_filepath],
-                    events=po2md_events,
+                #
+                # the PO files are passed already loaded, they will be saved
+                # at the end of the build
+                po2md = po2md_from_pofiles(
+                    [po, compendium_pofile],
+                    events=self.extensions.po2md_events,
                     wrapwidth=math.inf,  # ignore line wrapping
                 )
                 if page_meta_description:
@@ -435,34 +769,71 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
                         msgstr='',
                     ),
                 )
-                content = po2md.translate(markdown)
 
-                _disabled_msgids = [
+                # the page is parsed only once for all the languages
+                if md4c_events is None:
+                    md4c_events = parse_md4c_events(
+                        markdown,
+                        po2md.extensions,
+                    )
+                content = translate_md4c_events(po2md, markdown, md4c_events)
+
+                # msgids translated in the content must be found in the tree
+                # of the original page to render the translated page from
+                # it, which is only possible if the block structure of the
+                # content has not been changed by the translation
+                if self.config['render_from_original_tree']:
+                    if original_structure is None:
+                        original_structure = md4c_events_block_structure(
+                            md4c_events,
+                        )
+                    content_structure = md4c_events_block_structure(
+                        parse_md4c_events(content, po2md.extensions),
+                    )
+                    if content_structure == original_structure:
+                        _required_msgids = {
+                            entry.msgid for entry in po2md.translated_entries
+                            if entry.msgstr and entry.msgstr != entry.msgid
+                        }
+
+                # pages without translations in their content are rendered
+                # from the render of the original page
+                untranslated_page = not any(
+                    entry.msgstr for entry in po2md.translated_entries
+                )
+
+                _disabled_msgids = {
                     entry.msgid for entry in po2md.disabled_entries
-                ]
-                _disabled_msgids.extend(self.config['ignore_msgids'])
+                }
+                _disabled_msgids.update(self.config['ignore_msgids'])
 
                 for entry in po2md.translated_entries:
-                    _translated_entries_msgstrs.append(entry.msgstr)
-                    _translated_entries_msgids.append(entry.msgid)
+                    _translated_entries_msgstrs.add(entry.msgstr)
+                    _translated_entries_msgids.add(entry.msgid)
             else:
                 # mock variables if the file is excluded from being translated
                 content = markdown
                 translated_page_title = None
                 translated_page_desc = None
-                _disabled_msgids = []
-                _translated_entries_msgstrs = []
-                _translated_entries_msgids = []
-                po, po_filepath = [], None
-                translated_config_settings = {}
+                _disabled_msgids = set()
+                _translated_entries_msgstrs = set()
+                _translated_entries_msgids = set()
+                po, po_filepath = IndexedPOFile(), None
+                untranslated_page = True
+
+            # excluded pages are not rendered for languages without the
+            # minimum number of translated messages
+            if language in self.translations.excluded_languages:
+                continue
 
             temp_abs_path = self.translations.files[
                 page.file.src_path
             ][language]
             temp_abs_dirpath = os.path.dirname(temp_abs_path)
-            os.makedirs(temp_abs_dirpath, exist_ok=True)
-            with open(temp_abs_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            if not self.config['translated_files_in_memory']:
+                os.makedirs(temp_abs_dirpath, exist_ok=True)
+                with open(temp_abs_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
 
             new_file = mkdocs.structure.files.File(
                 temp_abs_path,
@@ -470,12 +841,19 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
                 config['site_dir'],
                 config['use_directory_urls'],
             )
+            if self.config['translated_files_in_memory']:
+                # the content is read from the file object instead of
+                # the temporal file (see `on_page_read_source` event)
+                new_file._mdpo_content = content
             new_file.url = os.path.relpath(
                 temp_abs_path,
                 self.translations.tempdir.name,
             )
             new_file._mdpo_language = language
 
+            # the title of the page will be 'page.title' (the original)
+            # if the file is being excluded from translations using the
+            # 'exclude' plugin's config setting
             new_page_title = translated_page_title or page.title
             new_page = mkdocs.structure.pages.Page(
                 new_page_title,
@@ -506,16 +884,11 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
                 language,
                 po,
                 po_filepath,
-                [entry.msgid for entry in po],  # po_msgids
                 _translated_entries_msgstrs,
                 _translated_entries_msgids,
                 _disabled_msgids,
             )
             self.translations.current = translation
-            if language not in self.translations.config_settings:
-                self.translations.config_settings[language] = (
-                    translated_config_settings
-                )
             if language not in self.translations.page_metas:
                 self.translations.page_metas[language] = {}
             if (
@@ -532,13 +905,6 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
                 url = removesuffix(url, 'index.html')
             new_page.file.url = url
 
-            # the title of the page will be 'page.title' (the original)
-            # if the file is being excluded from translations using the
-            # 'exclude' plugin's config setting
-            self.translations.nav[page.title][language] = [
-                new_page_title, new_page.file.url,
-            ]
-
             # set languages for search when 'cross_language_search'
             # is disabled
             #
@@ -571,15 +937,23 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
                             " 'plugins.search.lang' option",
                         )
 
-            mkdocs.commands.build._populate_page(
-                new_page,
-                config,
-                files,
-                dirty=(
-                    '--dirty' in sys.argv and
-                    '-c' not in sys.argv and '--clean' not in sys.argv
-                ),
-            )
+            if untranslated_page:
+                # rendered after the original page
+                # (see `on_page_content` event)
+                self.translations.untranslated_pages.append(
+                    (new_page, translation),
+                )
+            elif (
+                self.config['render_from_original_tree'] and
+                _required_msgids is not None
+            ):
+                # rendered after the original page
+                # (see `on_page_content` event)
+                self.translations.pending_pages.append(
+                    (new_page, translation, _required_msgids),
+                )
+            else:
+                self._populate_translated_page(new_page, config, files)
 
             if language not in self.translations.all:
                 self.translations.all[language] = []
@@ -601,110 +975,189 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
         # set languages to render in sitemap.xml
         page.file._mdpo_languages = _mdpo_languages
 
-        return remove_mdpo_commands_preserving_escaped(markdown)
-
-    def on_post_page(self, output, page, config):
-        if hasattr(page.file, '_mdpo_language'):
-            language = page.file._mdpo_language
+        markdown = remove_mdpo_commands_preserving_escaped(markdown)
+        if (
+            self.translations.pending_pages or
+            self.translations.untranslated_pages or
+            self.translations.excluded_translations
+        ):
+            self.translations.original_markdown = markdown
+        if self.translations.excluded_translations:
+            self.translations.original_po = original_po
+        return markdown
+
+    def on_page_content(self, html, page, config, files):
+        """Render the translated pages of the page that can be rendered from
+        its trees.
+
+        These are the excluded or untranslated pages, rendered from its
+        rendered tree, and the translated pages if
+        ``render_from_original_tree`` is enabled.
+
+        The PO files of the page in the languages excluded by
+        ``min_translated_messages`` are updated with the msgids handled by
+        the extensions in the original page.
+        """
+        translations = self.translations
+        if not translations.pending_pages and (
+            not translations.untranslated_pages
+        ) and not translations.excluded_translations:
+            return
 
-            # if the language should be included from the build, ignore it
-            min_translated = self.config['min_translated_messages']
-            if min_translated:
+        pending_pages, translations.pending_pages = (
+            translations.pending_pages,
+            [],
+        )
+        untranslated_pages, translations.untranslated_pages = (
+            translations.untranslated_pages,
+            [],
+        )
+        original_tree, translations.original_tree = (
+            translations.original_tree,
+            None,
+        )
+        original_msgids, translations.original_msgids = (
+            translations.original_msgids,
+            None,
+        )
+        original_title_msgids, translations.original_title_msgids = (
+            translations.original_title_msgids,
+            None,
+        )
+        excluded_translations, translations.excluded_translations = (
+            translations.excluded_translations,
+            [],
+        )
+        original_po, translations.original_po = (
+            translations.original_po,
+            None,
+        )
+        rendered_tree, translations.rendered_tree = (
+            translations.rendered_tree,
+            None,
+        )
 
-                stats = self.translations.stats[language]
-                if abs(min_translated) != min_translated:  # percent
-                    min_translated = abs(min_translated)
-                    if 'percent_translated' in stats:
-                        percent_translated = stats['percent_translated']
-                    else:
-                        percent_translated = (
-                            stats['translated'] / stats['total'] * 100
-                        )
-                        stats['percent_translated'] = percent_translated
-                    if percent_translated < min_translated:
-                        if language in self.config['languages']:
-                            logger.info(
-                                '[mdpo] '
-                                f'Excluding language "{language}". Translated'
-                                f' {readable_float(percent_translated)}%'
-                                f' ({stats["translated"]} of'
-                                f' {stats["total"]} messages) but'
-                                f' required {readable_float(min_translated)}%'
-                                ' at least.\n',
-                            )
-                            self.config['languages'].remove(language)
-                        return
-                else:
-                    if stats['translated'] < min_translated:
-                        if min_translated > stats['total']:
-                            logger.warning(
-                                '[mdpo] Found more required translated'
-                                f' messages ({min_translated}) than total of'
-                                f' them ({stats["total"]}). Using'
-                                f' {stats["total"]} for'
-                                ' "min_translated_messages" value.',
-                            )
-                            min_translated = stats['total']
-
-                        if language in self.config['languages']:
-                            logger.info(
-                                '[mdpo] '
-                                f'Excluding language "{language}".'
-                                f' Translated {stats["translated"]} messages'
-                                f' of {stats["total"]} but required'
-                                f' {min_translated} translated'
-                                ' messages at least.\n',
-                            )
-                            self.config['languages'].remove(language)
-                        return
+        # the trees can't be used if other plugins have changed the Markdown
+        # content after this one
+        if page.markdown != translations.original_markdown:
+            original_tree, rendered_tree = (None, None)
+            original_msgids, original_title_msgids = (None, None)
+        original_tree, rendered_tree = (
+            original_tree or None,
+            rendered_tree or None,
+        )
+        translations.original_markdown = None
+
+        if excluded_translations:
+            # msgids of the original page, `None` if they can't be used
+            msgids = (
+                extensions_msgids(
+                    original_msgids,
+                    original_title_msgids,
+                    {entry.msgid for entry in original_po},
+                ) if isinstance(original_msgids, list) and
+                isinstance(original_title_msgids, list) else None
+            )
+            for translation in excluded_translations:
+                collect_translation_msgids(translation, msgids)
 
-            # translate title and description replacing directly in HTML
-            if language in self.translations.config_settings:
-                tr_settings = self.translations.config_settings[language]
+        for new_page, translation in untranslated_pages:
+            translations.current = translation
+            self._populate_translated_page(
+                new_page,
+                config,
+                files,
+                render_tree=None if rendered_tree is None else (
+                    functools.partial(
+                        render_untranslated_tree,
+                        rendered_tree,
+                        translation,
+                        original_msgids,
+                    )
+                ),
+            )
 
-                if tr_settings.get('site_name'):
-                    output = output.replace(
-                        f'{config["site_name"]}</title>',
-                        f'{tr_settings["site_name"]}</title>',
+        for new_page, translation, required_msgids in pending_pages:
+            translations.current = translation
+            self._populate_translated_page(
+                new_page,
+                config,
+                files,
+                render_tree=None if original_tree is None else (
+                    functools.partial(
+                        render_translated_tree,
+                        original_tree,
+                        translation,
+                        translations.compendiums[translation.language],
+                        required_msgids,
                     )
+                ),
+            )
+        translations.current = None
+
+    def on_post_template(self, output_content, template_name, config):
+        search_patcher = self._search_patcher(config)
+        if search_patcher is not None and template_name.endswith('.html'):
+            output_content = search_patcher.patch_template(
+                output_content,
+                template_name,
+            )
+        return output_content
 
-                meta_description = self.translations.page_metas[
-                    language
-                ][page.file.src_path].get('description')
+    def on_post_page(self, output, page, config):
+        search_patcher = self._search_patcher(config)
+        if not hasattr(page.file, '_mdpo_language'):
+            if search_patcher is not None:
+                output = search_patcher.patch_html(
+                    output,
+                    self.config['default_language'],
+                )
+        else:
+            language = page.file._mdpo_language
 
-                if (
-                    meta_description or
-                    tr_settings.get('site_description') or
-                    config.get('site_description')
-                ):
-                    if meta_description:
-                        tr_description = meta_description
-                    elif tr_settings.get('site_description'):
-                        tr_description = tr_settings['site_description']
-                    elif config.get('site_description'):
-                        tr_description = config['site_description']
-
-                    if '<meta name="description"' not in output:
-                        output = output.replace(
-                            '/title>',
-                            (
-                                '/title><meta name="description"'
-                                ' content="">'
-                            ),
-                        )
+            # the translated site name and description are rendered by the
+            # theme (see `on_page_context` event), but the description of
+            # the page must be placed in the <head> if the theme doesn't
+            # render it
+            tr_settings = self.translations.config_settings.get(
+                language,
+                {},
+            )
+            meta_description = self.translations.page_metas[
+                language
+            ][page.file.src_path].get('description')
+
+            tr_description = (
+                meta_description or
+                tr_settings.get('site_description') or
+                config.get('site_description')
+            )
+            if tr_description:
+                head_end = output.find('</head>')
+                if head_end == -1:
+                    head_end = len(output)
+                head = output[:head_end]
+
+                if '<meta name="description"' not in head:
+                    head = head.replace(
+                        '/title>',
+                        '/title><meta name="description" content="">',
+                        1,
+                    )
 
-                    if not (
-                        config['theme'].name in {'mkdocs', 'readthedocs'} and
-                        removepreffix(page.file.url, language).count('/') > 1
-                    ):
-                        output = re.sub(
-                            r'<meta name="description" content="[^"]*"',
-                            (
-                                '<meta name="description"'
-                                f' content="{tr_description}"'
-                            ),
-                            output,
-                        )
+                if not (
+                    config['theme'].name in {'mkdocs', 'readthedocs'} and
+                    removepreffix(page.file.url, language).count('/') > 1
+                ):
+                    head = META_DESCRIPTION_RE.sub(
+                        lambda match: (
+                            '<meta name="description"'
+                            f' content="{tr_description}"'
+                        ),
+                        head,
+                        count=1,
+                    )
+                output = head + output[head_end:]
 
             # write translated HTML file to 'site' directory
             os.makedirs(
@@ -725,88 +1178,79 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
                 elif not render_path.endswith('.html'):
                     render_path += '.html'
 
-            # save locations of records with languages for search indexes usage
-            location = os.path.relpath(
-                removesuffix(render_path, 'index.html'),
-                config['site_dir'],
-            ) + '/'
-            self.translations.locations[location] = page.file._mdpo_language
+            # save locations of records with languages for search indexes
+            # usage, records are located by the URLs of their pages
+            self.translations.locations[page.url] = language
+
+            if search_patcher is not None:
+                output = search_patcher.patch_html(output, language)
 
             with open(render_path, 'w', encoding='utf-8') as f:
                 f.write(output)
+
+        if search_patcher is not None and search_patcher.shared_search_index:
+            search_index_json = get_search_plugin_index_json(
+                config['plugins'].get('search'),
+            )
+            if search_index_json is not None:
+                # records of the page, whose location is known at this
+                # point, are tagged with their language before the search
+                # index is serialized
+                search_patcher.tag_records(search_index_json['docs'])
+
         return output
 
     def on_post_build(self, config):
         self.translations.tempdir.cleanup()
 
-        if not self.config['cross_language_search']:
+        search_patcher = self._search_patcher(config)
+        if search_patcher is not None:
             # cross language search is disabled, so build indexes
-            # for each language and patch the 'site_dir' directory
-            search_patcher = TranslationsSearchPatcher(
-                config['site_dir'],
-                self.config['languages'],
-                self.config['default_language'],
-                # use mkdocs 'search' plugin if the theme
-                # has not its own implementation
-                (
-                    config['theme'].name
-                    if config['theme'].name
-                    in TranslationsSearchPatcher.supported_themes
-                    else 'mkdocs'
+            # for each language, HTML files are already patched
+            search_patcher.patch_site_dir(
+                get_search_plugin_index_json(
+                    config['plugins'].get('search'),
                 ),
-                self.translations.locations,
             )
-            search_patcher.patch_site_dir()
-
-        # save PO files for not excluded pages
-        for translations in self.translations.all.values():
-            for translation in translations:
-                # po_filepath is None if the file has been excluded from
-                # translations using 'exclude' config setting
-                if translation.po_filepath is not None:
-                    translation.po.save(translation.po_filepath)
 
         # dump repeated msgids from language files to compendium and
         # remove them from language files
         for language, translations in self.translations.all.items():
-            msgids, repeated_msgids = ([], [])
+            # repeated msgids are stored as dictionary keys to preserve
+            # the order in which they will be dumped into the compendium
+            msgids, repeated_msgids = (set(), {})
             for translation in translations:
-                for msgid in translation.po_msgids:
-                    if msgid in msgids:
-                        if msgid not in repeated_msgids:
-                            repeated_msgids.append(msgid)
+                for msgid, entries in translation.po_msgids.items():
+                    if msgid in msgids or len(entries) > 1:
+                        repeated_msgids[msgid] = None
                     else:
-                        msgids.append(msgid)
-            compendium_filepath = self.translations.compendium_files[language]
-            compendium_pofile = polib.pofile(compendium_filepath)
+                        msgids.add(msgid)
+            compendium_pofile = self.translations.compendiums[language]
 
-            # dump repeated msgids into compendium
+            # dump repeated msgids into compendium, the first entry found
+            # in the language files is moved to the compendium and the
+            # rest of them are removed, all at once for each file
+            removed_entries = [[] for _ in translations]
             for repeated_msgid in repeated_msgids:
-                _repeated_msgid_in_compendium = False
-                for entry in compendium_pofile:
-                    if entry.msgid == repeated_msgid:
-                        _repeated_msgid_in_compendium = True
-                        break
-
-                _msgids_appended_to_compendium = []
-                for translation in translations:
-                    _entry_found = None
-                    for entry in translation.po:
-                        if entry.msgid == repeated_msgid:
-                            if (
-                                repeated_msgid not in
-                                _msgids_appended_to_compendium and
-                                not _repeated_msgid_in_compendium
-                            ):
-                                compendium_pofile.append(entry)
-                                _msgids_appended_to_compendium.append(
-                                    repeated_msgid,
-                                )
-                            _entry_found = entry
-                            break
-                    if _entry_found:
-                        translation.po.remove(_entry_found)
-                        translation.po.save(translation.po_filepath)
+                _repeated_msgid_in_compendium = (
+                    repeated_msgid in compendium_pofile.msgid_entries
+                )
+                for translation, translation_removed_entries in zip(
+                    translations,
+                    removed_entries,
+                ):
+                    entries = translation.po.msgid_entries.get(repeated_msgid)
+                    if entries:
+                        entry = entries[0]
+                        if not _repeated_msgid_in_compendium:
+                            compendium_pofile.append(entry)
+                            _repeated_msgid_in_compendium = True
+                        translation_removed_entries.append(entry)
+            for translation, translation_removed_entries in zip(
+                translations,
+                removed_entries,
+            ):
+                translation.po.remove_entries(translation_removed_entries)
 
             for entry in compendium_pofile:
                 if entry.msgid not in repeated_msgids:
@@ -821,11 +1265,11 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
                 else:
                     remove_mdpo_setting_tags_from_po_entry(entry)
 
-            if len(compendium_pofile):
-                compendium_pofile.save(compendium_filepath)
-            else:
-                # remove empty compendium files
-                os.remove(compendium_filepath)
+            # empty compendium files are removed
+            self.translations.mark_dirty(
+                compendium_pofile if len(compendium_pofile) else None,
+                compendium_pofile.fpath,
+            )
 
             # mark not found msgstrs as obsolete
             for translation in translations:
@@ -835,7 +1279,13 @@ class MdpoPlugin(mkdocs.plugins.BasePlugin):
                     for entry in translation.po:
                         if entry.msgid not in translation.translated_msgids:
                             entry.obsolete = True
-                    translation.po.save(translation.po_filepath)
+                    self.translations.mark_dirty(
+                        translation.po,
+                        translation.po_filepath,
+                    )
+
+        # write PO files, each one only once
+        self.translations.flush_pofiles()
 
         # reset mkdocs build instance
         MkdocsBuild._instance = None
@@ -7,21 +7,46 @@ The patch implies several steps, which depend on the active theme:
    at 'search/search_index.json'.
 2. Separate original search index which includes all the records
    for all the languages in different search indexes, one per language.
+   The records are taken from the search index of the 'search' plugin
+   while it is still in memory, falling back to read the original
+   'search_index.json' file when it is not available.
    The files are named 'search_index_es.json', 'search_index_fr.json'...
 3. Patch the JS files which loads the 'search_index.json' file creating
    one for each language. This depends completely on the active theme.
-4. Patch HTML page files to load these language versions of JS files
-   instead of the original ones.
-5. Additionally, for themes like readthedocs, patchs HTML search files.
+4. Patch the HTML of pages and templates to load these language versions
+   of JS files instead of the original ones. The HTML is patched by the
+   plugin before each file is written, so they are written only once.
+5. Additionally, for themes like readthedocs, create the search pages
+   for each language.
+
+If 'shared_search_index' is enabled, the records of the original search
+index are tagged with their language instead and the JS files which load
+it are patched in place to restrict the search to the language of the
+current page, so HTML files are not patched.
 """
 
 import copy
 import json
 import logging
 import os
+import shutil
 
-from mkdocs_mdpo_plugin.mkdocs_utils import get_material_languages
-from mkdocs_mdpo_plugin.utils import get_package_version, removesuffix
+
+try:
+    from lunr import lunr
+    from lunr.languages import (
+        LANGUAGE_SUPPORT as LUNR_LANGUAGE_SUPPORT,
+        SUPPORTED_LANGUAGES as LUNR_LANGUAGES,
+    )
+except ImportError:  # pragma: no cover
+    lunr = None
+
+from mkdocs_mdpo_plugin.mkdocs_utils import (
+    LUNR_LANGUAGES_DIRPATH,
+    get_lunr_languages,
+    get_material_languages,
+)
+from mkdocs_mdpo_plugin.utils import get_package_version, text_file_has_content
 
 
 logger = logging.getLogger('mkdocs.plugins.mdpo')
@@ -76,7 +101,7 @@ THEME_WORKER_FILES_FUNCS = {
 ##
 
 
-def _material_patch_worker_js_files(files, language):
+def _material_patch_worker_js_files(files, language, *args):
     worker_js = files[0]
     new_path = _language_extension_path(worker_js['path'], '.js', language)
 
@@ -88,7 +113,7 @@ def _material_patch_worker_js_files(files, language):
         f.write(new_content)
 
 
-def _mkdocs_patch_worker_js_files(files, language):
+def _mkdocs_patch_worker_js_files(files, language, sharded=False):
     worker_js, main_js = files
 
     new_worker_js_path = _language_extension_path(
@@ -100,6 +125,8 @@ def _mkdocs_patch_worker_js_files(files, language):
         'search_index.json',
         f'search_index_{language}.json',
     )
+    if sharded:
+        new_worker_js_content += SHARDED_SEARCH_INDEX_WORKER_JS
     with open(new_worker_js_path, 'w', encoding='utf-8') as f:
         f.write(new_worker_js_content)
 
@@ -123,105 +150,372 @@ THEME_WORKER_PATCHS_FUNCS = {
 }
 
 ##
-# Patch HTML files to load language JS worker files.
+# Sharded search indexes.
 ##
 
+# the search index of the language is a manifest with the paths of its
+# shards, which are loaded on demand by the worker when searching
+SHARDED_SEARCH_INDEX_WORKER_JS = r"""
+/* mkdocs-mdpo-plugin sharded search index */
+var mdpoShards = [];
+var mdpoQuery;
+var mdpoLoadingShard = false;
+
+function mdpoBuildShardIndex(shard) {
+  if (shard.index) {
+    return lunr.Index.load(shard.index);
+  }
+  return lunr(function () {
+    if (lang.length === 1 && lang[0] !== "en" && lunr[lang[0]]) {
+      this.use(lunr[lang[0]]);
+    } else if (lang.length > 1) {
+      this.use(lunr.multiLanguage.apply(null, lang));
+    }
+    this.field('title');
+    this.field('text');
+    this.ref('location');
+    for (var i = 0; i < shard.docs.length; i++) {
+      this.add(shard.docs[i]);
+    }
+  });
+}
 
-def _material_patch_html_file(fpath, language, worker_files):
-    with open(fpath) as f:
-        content = f.read()
+function mdpoLoadShard(shard, callback) {
+  var oReq = new XMLHttpRequest();
+  oReq.addEventListener("load", function () {
+    var shardData = JSON.parse(this.responseText);
+    shard.docs = shardData.docs;
+    shard.index = shardData.index;
+    shard.documents = {};
+    shard.docs.forEach(function (doc) {
+      shard.documents[doc.location] = doc;
+    });
+    shard.lunrIndex = mdpoBuildShardIndex(shard);
+    callback();
+  });
+  var shard_path = base_path + '/' + shard.path;
+  if ('function' === typeof importScripts) {
+    shard_path = shard.path;
+  }
+  oReq.open("GET", shard_path);
+  oReq.send();
+}
 
-    worker_js_fname = os.path.basename(worker_files[0]['path'])
-    worker_js_fname_lang = _language_extension_path(
-        worker_js_fname,
-        '.js',
-        language,
-    )
+function mdpoPendingShards() {
+  return mdpoShards.filter(function (shard) {
+    return !shard.lunrIndex;
+  });
+}
 
-    new_content = content.replace(
-        f'{worker_js_fname}',
-        f'{worker_js_fname_lang}',
-    )
-    with open(fpath, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+function mdpoLoadShards(callback) {
+  var pending = mdpoPendingShards();
+  if (!pending.length) {
+    callback();
+    return;
+  }
+  mdpoLoadShard(pending[0], function () {
+    mdpoLoadShards(callback);
+  });
+}
 
+// results are posted for the loaded shards, loading the next one
+// until all are loaded, for the last query received
+function mdpoSearchOnDemand() {
+  var pending = mdpoPendingShards();
+  if (pending.length < mdpoShards.length || !pending.length) {
+    postMessage({results: search(mdpoQuery)});
+  }
+  if (pending.length && !mdpoLoadingShard) {
+    mdpoLoadingShard = true;
+    mdpoLoadShard(pending[0], function () {
+      mdpoLoadingShard = false;
+      mdpoSearchOnDemand();
+    });
+  }
+}
 
-def _mkdocs_patch_html_file(fpath, language, *args):
-    with open(fpath) as f:
-        content = f.read()
+onScriptsLoaded = function () {
+  if (data.config && data.config.separator && data.config.separator.length) {
+    lunr.tokenizer.separator = new RegExp(data.config.separator);
+  }
+  mdpoShards = data.shards.map(function (path) {
+    return {path: path};
+  });
+  var ready = function () {
+    allowSearch = true;
+    postMessage({config: data.config});
+    postMessage({allowSearch: allowSearch});
+  };
+  if ('function' === typeof importScripts) {
+    ready();
+  } else {
+    // search is synchronous in the main thread
+    mdpoLoadShards(ready);
+  }
+};
+
+search = function (query) {
+  var results = [];
+  mdpoShards.forEach(function (shard) {
+    if (!shard.lunrIndex) {
+      return;
+    }
+    shard.lunrIndex.search(query).forEach(function (result) {
+      var doc = shard.documents[result.ref];
+      doc.summary = doc.text.substring(0, 200);
+      results.push({score: result.score, doc: doc});
+    });
+  });
+  results.sort(function (a, b) {
+    return b.score - a.score;
+  });
+  return results.map(function (result) {
+    return result.doc;
+  });
+};
+
+if ('function' === typeof importScripts) {
+  onmessage = function (e) {
+    if (e.data.init) {
+      init();
+    } else if (e.data.query) {
+      mdpoQuery = e.data.query;
+      mdpoSearchOnDemand();
+    } else {
+      console.error("Worker - Unrecognized message: " + e);
+    }
+  };
+}
+"""
 
-    new_content = content.replace(
-        'search/main.js',
-        f'search/main_{language}.js',
-    )
-    with open(fpath, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+THEMES_SUPPORTING_SHARDED_SEARCH_INDEXES = {'mkdocs', 'readthedocs'}
 
 
-THEME_HTML_PATCHS_FUNCS = {
-    'material': _material_patch_html_file,
-    'mkdocs': _mkdocs_patch_html_file,
-    'readthedocs': _mkdocs_patch_html_file,
-}
+def _record_section(record, language):
+    """Return the top level section of the location of a record, without
+    the language directory."""
+    parts = record['location'].split('#')[0].split('/')
+    if len(parts) > 1 and parts[0] == language:
+        parts = parts[1:]
+    return parts[0] if len(parts) > 1 else ''
+
+
+def _shard_records(records, language, shard_size):
+    """Split the records of a language by top level sections in shards
+    whose approximate size in bytes is at most ``shard_size``. Sections
+    bigger than the size are split between several shards."""
+    sections = {}
+    for record in records:
+        sections.setdefault(_record_section(record, language), []).append(
+            (record, len(json.dumps(record, separators=(',', ':')))),
+        )
+
+    shards, shard, size = [], [], 0
+    for section_records in sections.values():
+        section_size = sum(record_size for _, record_size in section_records)
+        if shard and size + section_size > shard_size:
+            shards.append(shard)
+            shard, size = [], 0
+        for record, record_size in section_records:
+            if shard and size + record_size > shard_size:
+                shards.append(shard)
+                shard, size = [], 0
+            shard.append(record)
+            size += record_size
+    if shard:
+        shards.append(shard)
+    return shards
+
 
 ##
-# Get search files
+# Patch Javascript worker files for a shared search index.
 ##
 
+SHARED_SEARCH_INDEX_JS_MARKER = '/* mkdocs-mdpo-plugin shared search index */'
+
+# locations of the current page relative to the site root, including those
+# of the referrer for pages which are not indexed, like search pages
+PAGE_LOCATIONS_JS = r"""
+function mdpoPageLocations(baseUrl) {
+  var root = new URL(baseUrl.replace(/\/?$/, '/'), window.location.href);
+  var locations = [];
+  [window.location.href, document.referrer].forEach(function (href) {
+    if (!href) {
+      return;
+    }
+    var url = new URL(href);
+    if (
+      url.origin !== root.origin ||
+      url.pathname.indexOf(root.pathname) !== 0
+    ) {
+      return;
+    }
+    var location = decodeURIComponent(
+      url.pathname.substring(root.pathname.length)
+    );
+    locations.push(location, location.replace(/index\.html$/, ''));
+  });
+  return locations;
+}
+"""
+
+# records of the language of the first location found in the index
+FILTER_DOCS_JS = r"""
+function mdpoFilterDocs(docs, locations) {
+  var languages = {};
+  docs.forEach(function (doc) {
+    languages[doc.location] = doc.lang;
+  });
+  var language = mdpoDefaultLanguage;
+  for (var i = 0; i < (locations || []).length; i++) {
+    if (languages.hasOwnProperty(locations[i])) {
+      language = languages[locations[i]];
+      break;
+    }
+  }
+  return docs.filter(function (doc) {
+    return doc.lang === language;
+  });
+}
+"""
+
+
+def _write_shared_worker_js_file(js_file, new_content):
+    with open(js_file['path'], 'w', encoding='utf-8') as f:
+        f.write(new_content)
+    js_file['content'] = new_content
+
+
+def _material_patch_shared_worker_js_files(files, default_language):
+    bundle_js = files[0]
+    if SHARED_SEARCH_INDEX_JS_MARKER in bundle_js['content']:
+        return
+
+    # the bundle sends the search index to the worker, so the records
+    # of other languages are removed from the message
+    new_content = (
+        f'{SHARED_SEARCH_INDEX_JS_MARKER}\n(function () {{\n'
+        f'var mdpoDefaultLanguage = {json.dumps(default_language)};\n'
+        f'{PAGE_LOCATIONS_JS}{FILTER_DOCS_JS}'
+        """
+var locations = mdpoPageLocations(
+  JSON.parse(document.getElementById('__config').textContent).base
+);
+var Worker_ = window.Worker;
+window.Worker = function (url, options) {
+  var worker = new Worker_(url, options);
+  var postMessage = worker.postMessage;
+  worker.postMessage = function (message) {
+    if (message && message.data && message.data.docs) {
+      message.data.docs = mdpoFilterDocs(message.data.docs, locations);
+      delete message.data.index;
+    }
+    return postMessage.apply(worker, arguments);
+  };
+  return worker;
+};
+})();
+"""
+        f'{bundle_js["content"]}'
+    )
+    _write_shared_worker_js_file(bundle_js, new_content)
+
+
+def _mkdocs_patch_shared_worker_js_files(files, default_language):
+    worker_js, main_js = files
 
-def _readthedocs_get_search_files(site_dir):
-    search_file_path = os.path.join(site_dir, 'search.html')
-    with open(search_file_path) as f:
-        search_file_content = f.read()
-    return [{'path': search_file_path, 'content': search_file_content}]
+    if SHARED_SEARCH_INDEX_JS_MARKER not in main_js['content']:
+        new_main_js_content = (
+            f'{SHARED_SEARCH_INDEX_JS_MARKER}\n{PAGE_LOCATIONS_JS}'
+            'var mdpoLocations = mdpoPageLocations(base_url);\n'
+            f'{main_js["content"]}'
+        ).replace(
+            'searchWorker.postMessage({init: true});',
+            'searchWorker.postMessage('
+            '{init: true, locations: mdpoLocations});',
+        )
+        _write_shared_worker_js_file(main_js, new_main_js_content)
+
+    if SHARED_SEARCH_INDEX_JS_MARKER not in worker_js['content']:
+        # when Web Workers are not supported, this file is loaded in the
+        # main thread, so 'mdpoLocations' is defined by the main script
+        new_worker_js_content = (
+            f'{worker_js["content"]}\n{SHARED_SEARCH_INDEX_JS_MARKER}\n'
+            'var mdpoLocations;\n'
+            f'var mdpoDefaultLanguage = {json.dumps(default_language)};\n'
+            f'{FILTER_DOCS_JS}'
+            """
+var mdpoOnScriptsLoaded = onScriptsLoaded;
+onScriptsLoaded = function () {
+  data.docs = mdpoFilterDocs(data.docs, mdpoLocations);
+  delete data.index;
+  mdpoOnScriptsLoaded();
+};
+if ('function' === typeof importScripts) {
+  var mdpoOnMessage = onmessage;
+  onmessage = function (e) {
+    if (e.data.init) {
+      mdpoLocations = e.data.locations;
+    }
+    mdpoOnMessage(e);
+  };
+}
+"""
+        )
+        _write_shared_worker_js_file(worker_js, new_worker_js_content)
 
 
-THEME_GET_SEARCH_FILES_FUNCS = {
-    'readthedocs': _readthedocs_get_search_files,
+THEME_SHARED_WORKER_PATCHS_FUNCS = {
+    'material': _material_patch_shared_worker_js_files,
+    'mkdocs': _mkdocs_patch_shared_worker_js_files,
+    'readthedocs': _mkdocs_patch_shared_worker_js_files,
 }
 
 ##
-# Patch search files
+# Patch HTML contents to load language JS worker files.
 ##
 
 
-def _reathedocs_patch_search_files(
-        fpath,
-        language,
-        default_language,
-        search_files,
-):
-    search_file = search_files[0]
-
-    # create search file for the language if not exists
-    lang_search_path = _language_extension_path(
-        search_file['path'],
-        '.html',
+def _material_patch_html(content, language, worker_files):
+    worker_js_fname = os.path.basename(worker_files[0]['path'])
+    worker_js_fname_lang = _language_extension_path(
+        worker_js_fname,
+        '.js',
         language,
     )
-    lang_search_path_content = search_file['content'].replace(
-        'search.html',
-        f'search_{language}.html',
-    ).replace(
-        f'search/main_{default_language}.js',
+    return content.replace(
+        f'{worker_js_fname}',
+        f'{worker_js_fname_lang}',
+    )
+
+
+def _mkdocs_patch_html(content, language, *args):
+    return content.replace(
+        'search/main.js',
         f'search/main_{language}.js',
     )
-    with open(lang_search_path, 'w', encoding='utf-8') as f:
-        f.write(lang_search_path_content)
 
-    # patch search file URL in language file
-    with open(fpath) as f:
-        content = f.read()
-    new_content = content.replace(
+
+def _readthedocs_patch_html(content, language, *args):
+    # the search page is also localized, see `THEME_SEARCH_TEMPLATES`
+    return _mkdocs_patch_html(content, language).replace(
         'search.html',
         f'search_{language}.html',
     )
-    with open(fpath, 'w', encoding='utf-8') as f:
-        f.write(new_content)
 
 
-THEME_PATCH_SEARCH_FILES_FUNCS = {
-    'readthedocs': _reathedocs_patch_search_files,
+THEME_HTML_PATCHS_FUNCS = {
+    'material': _material_patch_html,
+    'mkdocs': _mkdocs_patch_html,
+    'readthedocs': _readthedocs_patch_html,
+}
+
+##
+# Templates of search pages, which need a copy for each language
+##
+
+THEME_SEARCH_TEMPLATES = {
+    'readthedocs': {'search.html'},
 }
 
 ##
@@ -244,11 +538,72 @@ def _patch_material_search_index_lang(language, search_index):
     search_index['config']['lang'] = [language]
 
 
+def _patch_mkdocs_search_index_lang(language, search_index):
+    # languages not supported by lunr.js keep the ones of the search plugin
+    if language in get_lunr_languages():
+        search_index['config']['lang'] = [language]
+
+
 THEME_PATCH_SEARCH_INDEX_LANG = {
     'material': _patch_material_search_index_lang,
+    'mkdocs': _patch_mkdocs_search_index_lang,
+    'readthedocs': _patch_mkdocs_search_index_lang,
 }
 
 
+def _copy_lunr_language_files(languages, search_dirpath):
+    """Copy the lunr.js files loaded by the worker of the 'search' plugin
+    for the languages of a search index, as the plugin only copies the
+    ones of its own languages.
+    """
+    filenames = []
+    if len(languages) > 1 or 'en' not in languages:
+        filenames.append('lunr.stemmer.support.js')
+    if len(languages) > 1:
+        filenames.append('lunr.multi.js')
+    if 'ja' in languages or 'jp' in languages:
+        filenames.append('tinyseg.js')
+    filenames.extend(
+        f'lunr.{language}.js' for language in languages if language != 'en'
+    )
+
+    for filename in filenames:
+        filepath = os.path.join(search_dirpath, filename)
+        if not os.path.isfile(filepath):
+            shutil.copyfile(
+                os.path.join(LUNR_LANGUAGES_DIRPATH, filename),
+                filepath,
+            )
+
+
+def _prebuild_search_index(records, config):
+    """Build a serialized lunr index for the records of a search index.
+
+    The languages of the pipeline are the ones of the configuration of the
+    search index, which are the ones loaded by the client to use the index.
+    """
+    languages = [
+        language for language in config.get('lang') or []
+        if language in LUNR_LANGUAGES
+    ]
+    return lunr(
+        ref='location',
+        fields=('title', 'text'),
+        documents=records,
+        languages=languages or None,
+    ).serialize()
+
+
+def get_search_plugin_index_json(search_plugin):
+    """Returns the search index of the mkdocs 'search' plugin in the
+    same structure in which is dumped to 'search_index.json', or
+    ``None`` if it is not available."""
+    search_index = getattr(search_plugin, 'search_index', None)
+    if search_index is None or not hasattr(search_index, '_entries'):
+        return None
+    return {'docs': search_index._entries, 'config': search_index.config}
+
+
 class TranslationsSearchPatcher:
     supported_themes = THEME_WORKER_FILES_FUNCS.keys()
 
@@ -259,6 +614,8 @@ class TranslationsSearchPatcher:
             default_language,
             theme_name,
             locations,
+            shared_search_index=False,
+            search_index_shard_size=None,
     ):
         self.site_dir = site_dir
         self.search_index_json_path = os.path.join(
@@ -267,11 +624,6 @@ class TranslationsSearchPatcher:
             'search_index.json',
         )
 
-        with open(self.search_index_json_path) as f:
-            self.search_index_json = json.load(f)
-
-        self.search_index = self.search_index_json['docs']
-
         self.languages = languages
         self.default_language = default_language
         self.theme_name = theme_name
@@ -279,10 +631,32 @@ class TranslationsSearchPatcher:
         # map from locations of files to languages
         self.locations = locations
 
-        # {lang: [records]}
-        self.lang_search_indexes = {language: [] for language in languages}
+        # if enabled, the records of the original search index are tagged
+        # with their language and the worker files filter them
+        self.shared_search_index = shared_search_index
+
+        # number of records of the original search index already tagged
+        self._tagged_records = 0
+
+        # if defined, the search index of each language is split in
+        # shards of this approximate size in bytes
+        if search_index_shard_size and (
+            shared_search_index or
+            theme_name not in THEMES_SUPPORTING_SHARDED_SEARCH_INDEXES
+        ):
+            unsupported_reason = (
+                'with a shared search index' if shared_search_index
+                else f"by the theme '{theme_name}'"
+            )
+            logger.warning(
+                "[mdpo] The 'search_index_shard_size' option is not"
+                f' supported {unsupported_reason}, ignoring it',
+            )
+            search_index_shard_size = None
+        self.search_index_shard_size = search_index_shard_size
 
-        # worker files which load search indexes
+        # worker files which load search indexes, the patcher must be
+        # created after static files are copied to the site directory
         self.worker_js_files = THEME_WORKER_FILES_FUNCS[self.theme_name](
             self.site_dir,
         )
@@ -293,95 +667,197 @@ class TranslationsSearchPatcher:
                     f' site directory {self.site_dir}',
                 )
 
-    def patch_site_dir(self):
+    def patch_html(self, content, language):
+        """Patch the HTML content of a file to load the assets of the
+        search for the language.
+        """
+        if self.shared_search_index:
+            return content
+        return THEME_HTML_PATCHS_FUNCS[self.theme_name](
+            content,
+            language,
+            self.worker_js_files,
+        )
+
+    def patch_template(self, content, template_name):
+        """Patch the HTML content of a template of the theme, writing the
+        search pages of the languages if it is one of them.
+        """
+        if self.shared_search_index:
+            return content
+        if template_name in THEME_SEARCH_TEMPLATES.get(self.theme_name, ()):
+            template_path = os.path.join(self.site_dir, template_name)
+            for language in self.languages:
+                lang_search_path = _language_extension_path(
+                    template_path,
+                    '.html',
+                    language,
+                )
+                lang_search_content = self.patch_html(content, language)
+                if not text_file_has_content(
+                    lang_search_path,
+                    lang_search_content,
+                ):
+                    with open(lang_search_path, 'w', encoding='utf-8') as f:
+                        f.write(lang_search_content)
+        return self.patch_html(content, self.default_language)
+
+    def record_language(self, record):
+        """Return the language of a record of the original search index."""
+        return self.locations.get(
+            record['location'].split('#')[0],
+            self.default_language,
+        )
+
+    def tag_records(self, records):
+        """Tag the records of the original search index not tagged yet
+        with their language.
+        """
+        for record in records[self._tagged_records:]:
+            record['lang'] = self.record_language(record)
+        self._tagged_records = len(records)
+
+    def patch_site_dir(self, search_index_json=None):
+        # the search index is passed from memory by the plugin when
+        # available to avoid parsing the serialized one
+        search_index_in_memory = search_index_json is not None
+        if not search_index_in_memory:
+            with open(self.search_index_json_path) as f:
+                search_index_json = json.load(f)
+
+        if self.shared_search_index:
+            # the records of the index in memory are tagged before it is
+            # serialized, so the original file is only rewritten when
+            # it has been read
+            self.tag_records(search_index_json['docs'])
+            if not search_index_in_memory:
+                self._dump_search_index_json(
+                    search_index_json,
+                    self.search_index_json_path,
+                )
+            THEME_SHARED_WORKER_PATCHS_FUNCS[self.theme_name](
+                self.worker_js_files,
+                self.default_language,
+            )
+            return
+
+        # the index of the search plugin in memory has not been prebuilt yet
+        prebuild_index = bool(
+            'index' in search_index_json or
+            search_index_json['config'].get('prebuild_index'),
+        )
+        if prebuild_index and lunr is None:
+            logger.warning(
+                '[mdpo] The search indexes for each language can not be'
+                " prebuilt because 'lunr' is not installed, they will be"
+                ' built in the browser. Install it with'
+                " 'pip install lunr[languages]'.",
+            )
+
         # build indexes for languages
-        for record in self.search_index:
-            if not record['location']:
-                self.lang_search_indexes[self.default_language].append(record)
-            elif '#' in record['location']:
-                if record['location'].startswith('#'):
-                    self.lang_search_indexes[self.default_language].append(
-                        record,
-                    )
-                else:
-                    clean_location = record['location'].split('#')[0]
-                    if clean_location in self.locations:
-                        language = self.locations[clean_location]
-                        self.lang_search_indexes[language].append(record)
-            elif record['location'] in self.locations:
-                language = self.locations[record['location']]
-                self.lang_search_indexes[language].append(record)
-
-        # get site directory HTML files ordered by language
-        html_files_by_language = self._get_html_files_by_language()
+        # {lang: [records]}
+        lang_search_indexes = {language: [] for language in self.languages}
+        for record in search_index_json['docs']:
+            lang_search_indexes[self.record_language(record)].append(record)
 
         for language in self.languages:
             # create indexes for languages
             self._create_lang_search_index_json(
+                search_index_json,
                 language,
-                self.lang_search_indexes[language],
+                lang_search_indexes[language],
+                prebuild_index,
             )
 
             # create javascript assets by language to load custom
             # search_index_{language}.json files depending on the
             # active theme
-
-            # patch Javascript worker files for the language
             THEME_WORKER_PATCHS_FUNCS[self.theme_name](
                 self.worker_js_files,
                 language,
+                bool(self.search_index_shard_size),
             )
 
-            # patch HTML files to load localized assets
-            for fpath in html_files_by_language[language]:
-                THEME_HTML_PATCHS_FUNCS[self.theme_name](
-                    fpath,
-                    language,
-                    self.worker_js_files,
-                )
-
-        # if the theme needs to patch search files, patch them
-        if self.theme_name in THEME_GET_SEARCH_FILES_FUNCS:
-            search_files = THEME_GET_SEARCH_FILES_FUNCS[self.theme_name](
-                self.site_dir,
-            )
-            for language in self.languages:
-                for fpath in html_files_by_language[language]:
-                    THEME_PATCH_SEARCH_FILES_FUNCS[self.theme_name](
-                        fpath,
-                        language,
-                        self.default_language,
-                        search_files,
-                    )
-
-    def _create_lang_search_index_json(self, language, records):
-        search_index = copy.copy(self.search_index_json)
+    def _create_lang_search_index_json(
+            self,
+            search_index_json,
+            language,
+            records,
+            prebuild_index,
+    ):
+        search_index = copy.copy(search_index_json)
         search_index['docs'] = records
+        search_index['config'] = copy.copy(search_index['config'])
         if self.theme_name in THEME_PATCH_SEARCH_INDEX_LANG:
             THEME_PATCH_SEARCH_INDEX_LANG[self.theme_name](
                 language,
                 search_index,
             )
+        if self.theme_name != 'material':
+            _copy_lunr_language_files(
+                search_index['config'].get('lang') or ['en'],
+                os.path.dirname(self.search_index_json_path),
+            )
+
+        # the prebuilt index of the original search index includes the
+        # records of all languages
+        search_index.pop('index', None)
+        prebuild_index = prebuild_index and lunr is not None
+        if prebuild_index and not LUNR_LANGUAGE_SUPPORT and any(
+            lang != 'en' and lang in LUNR_LANGUAGES
+            for lang in search_index['config'].get('lang') or []
+        ):
+            # lunr.py would build the index with the English pipeline, which
+            # doesn't match the one used by the browser for the language
+            logger.warning(
+                f"[mdpo] The search index for the language '{language}' can"
+                " not be prebuilt because the language support of 'lunr' is"
+                ' not installed, it will be built in the browser. Install it'
+                " with 'pip install lunr[languages]'.",
+            )
+            prebuild_index = False
 
         new_path = _language_extension_path(
             self.search_index_json_path,
             '.json',
             language,
         )
-        with open(new_path, 'w') as f:
-            json.dump(search_index, f)
-
-    def _get_html_files_by_language(self):
-        language_files = {language: [] for language in self.languages}
-
-        for root, _, files in os.walk(self.site_dir):
-            for fname in [f for f in files if f.endswith('.html')]:
-                fpath = os.path.join(root, fname)
-                relpath = os.path.relpath(fpath, self.site_dir)
-                location = removesuffix(relpath, 'index.html')
-                if location in self.locations:
-                    language = self.locations[location]
-                    language_files[language].append(fpath)
-                else:
-                    language_files[self.default_language].append(fpath)
-        return language_files
+        if self.search_index_shard_size:
+            # the index of the language is a manifest of its shards
+            search_index['docs'] = []
+            search_index['shards'] = []
+            shards = _shard_records(
+                records,
+                language,
+                self.search_index_shard_size,
+            )
+            for i, shard_records in enumerate(shards):
+                shard = {'docs': shard_records}
+                if prebuild_index:
+                    shard['index'] = _prebuild_search_index(
+                        shard_records,
+                        search_index['config'],
+                    )
+                shard_path = _language_extension_path(
+                    new_path,
+                    '.json',
+                    str(i),
+                )
+                self._dump_search_index_json(shard, shard_path)
+                search_index['shards'].append(os.path.basename(shard_path))
+        elif prebuild_index:
+            search_index['index'] = _prebuild_search_index(
+                records,
+                search_index['config'],
+            )
+        self._dump_search_index_json(search_index, new_path)
+
+    def _dump_search_index_json(self, search_index, fpath):
+        with open(fpath, 'w') as f:
+            json.dump(
+                search_index,
+                f,
+                sort_keys=True,
+                separators=(',', ':'),
+                default=str,
+            )
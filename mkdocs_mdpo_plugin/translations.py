@@ -1,12 +1,184 @@
+import concurrent.futures
+import copy
+import itertools
+import os
 import tempfile
 
+import polib
+
+from mkdocs_mdpo_plugin.mdpo_utils import save_pofile
+
+
+class IndexedPOFile(polib.POFile):
+    """:py:class:`polib.POFile` which keeps an index of its entries by msgid,
+    so entries can be retrieved without iterating over the whole file.
+
+    The index and the messages statistics of the file are updated when
+    entries are added or removed through the ``append``, ``insert`` and
+    ``remove`` methods. Can be passed to :py:func:`polib.pofile` using
+    the ``klass`` argument.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # {msgid: [entries]}, ordered as the entries are found in the file
+        self.msgid_entries = {}
+
+        # number of translated and total messages, an entry is considered
+        # translated if it has a msgstr or is obsolete when is added
+        self.n_translated, self.n_total = (0, 0)
+
+        # identifiers of the entries counted as translated
+        self._translated_entries_ids = set()
+
+        # statistics dictionaries updated with the changes in the counters
+        # {total: int, translated: int}
+        self._tracked_stats = []
+
+    def _count_entry(self, entry, increment):
+        if increment > 0:
+            translated = entry.msgstr or entry.obsolete
+            if translated:
+                self._translated_entries_ids.add(id(entry))
+        else:
+            translated = id(entry) in self._translated_entries_ids
+            if translated:
+                self._translated_entries_ids.remove(id(entry))
+
+        self.n_total += increment
+        if translated:
+            self.n_translated += increment
+        for stats in self._tracked_stats:
+            stats['total'] += increment
+            if translated:
+                stats['translated'] += increment
+
+    def track_stats(self, stats):
+        """Add the messages statistics of the file to a dictionary.
+
+        The counters of the dictionary are updated with the messages added
+        or removed later, so can be shared by multiple files to aggregate
+        their statistics.
+
+        Args:
+            stats (dict): Dictionary with ``translated`` and ``total``
+                number of messages.
+        """
+        stats['translated'] += self.n_translated
+        stats['total'] += self.n_total
+        self._tracked_stats.append(stats)
+
+    def append(self, entry):
+        super().append(entry)
+        self._count_entry(entry, 1)
+        if entry.msgid not in self.msgid_entries:
+            self.msgid_entries[entry.msgid] = [entry]
+        else:
+            self.msgid_entries[entry.msgid].append(entry)
+
+    def insert(self, index, entry):
+        """Insert an entry in the file before the given index.
+
+        Entries are indexed in constant time when they are inserted at the
+        beginning of the file, as the plugin does for titles, descriptions
+        and configuration settings, or when their msgid is not in the file.
+        Otherwise the entries before the inserted one are iterated to index
+        it, which takes linear time.
+        """
+        super().insert(index, entry)
+        self._count_entry(entry, 1)
+        if entry.msgid not in self.msgid_entries:
+            self.msgid_entries[entry.msgid] = [entry]
+        elif index == 0:
+            self.msgid_entries[entry.msgid].insert(0, entry)
+        else:
+            # the entry is indexed after the entries with the same msgid
+            # placed before it in the file
+            if index < 0:
+                index = max(len(self) - 1 + index, 0)
+            entries = self.msgid_entries[entry.msgid]
+            entries_ids = {id(_entry) for _entry in entries}
+            position = sum(
+                1 for _entry in itertools.islice(self, index)
+                if id(_entry) in entries_ids
+            )
+            entries.insert(position, entry)
+
+    def remove(self, entry):
+        """Remove an entry from the file.
+
+        Unlike :py:meth:`list.remove`, the entry is searched by identity
+        and not by equality, so the entry removed is always the one passed.
+        """
+        self.remove_entries([entry])
+
+    def remove_entries(self, entries):
+        """Remove several entries from the file at once.
+
+        The entries are searched by identity, like in :py:meth:`remove`,
+        but the file is iterated only once for all of them.
+
+        Args:
+            entries (list): Entries to remove from the file.
+        """
+        removed_ids = {id(entry) for entry in entries}
+        if not removed_ids:
+            return
+
+        kept_entries, removed_msgids = ([], set())
+        for entry in self:
+            if id(entry) in removed_ids:
+                self._count_entry(entry, -1)
+                removed_msgids.add(entry.msgid)
+            else:
+                kept_entries.append(entry)
+        n_removed = len(self) - len(kept_entries)
+        self[:] = kept_entries
+
+        for msgid in removed_msgids:
+            msgid_entries = [
+                entry for entry in self.msgid_entries[msgid]
+                if id(entry) not in removed_ids
+            ]
+            if msgid_entries:
+                self.msgid_entries[msgid] = msgid_entries
+            else:
+                del self.msgid_entries[msgid]
+
+        if n_removed != len(removed_ids):
+            raise ValueError(
+                f'{len(removed_ids) - n_removed} entries not found in file',
+            )
+
+    def merge(self, entries, copy_entries=False):
+        """Append the entries which are not already included in the file.
+
+        An entry is considered included if the file contains a non obsolete
+        entry with the same msgctxt and msgid, just like the ``in`` operator
+        of :py:class:`polib.POFile` does, but the merge is done in linear
+        time and the order of the entries is preserved.
+
+        Args:
+            entries (list): Entries to merge into the file.
+            copy_entries (bool): Append copies of the entries instead of the
+                entries passed.
+        """
+        keys = {(e.msgctxt, e.msgid) for e in self if not e.obsolete}
+        for entry in entries:
+            key = (entry.msgctxt, entry.msgid)
+            if key in keys:
+                continue
+            self.append(copy.deepcopy(entry) if copy_entries else entry)
+            if not entry.obsolete:
+                keys.add(key)
+
 
 class Translation:
     __slots__ = {
         'language',
         'po',
         'po_filepath',
-        'po_msgids',
         'translated_msgstrs',
         'translated_msgids',
         'disabled_msgids',
@@ -17,7 +189,6 @@ class Translation:
             language,
             po,
             po_filepath,
-            po_msgids,
             translated_msgstrs,
             translated_msgids,
             disabled_msgids,
@@ -25,21 +196,40 @@ class Translation:
         self.language = language
         self.po = po
         self.po_filepath = po_filepath
-        self.po_msgids = po_msgids
+
+        # sets of msgids and msgstrs handled while translating the page
         self.translated_msgstrs = translated_msgstrs
         self.translated_msgids = translated_msgids
         self.disabled_msgids = disabled_msgids
 
+    @property
+    def po_msgids(self):
+        """Msgids of the PO file, ordered as they were added to it.
+
+        Is a view of the index of the PO file, so it includes the entries
+        added while the page is rendered.
+        """
+        return self.po.msgid_entries
+
+    @property
+    def stats(self):
+        """Number of translated and total messages of the page."""
+        return {
+            'total': self.po.n_total,
+            'translated': self.po.n_translated,
+        }
+
     def __str__(self):  # pragma: no cover
         return (
             f'Translation(language="{self.language}",'
             f' po=polib.POFile(...{str(len(self.po)) + " entries"}...)'
             f' po_filepath="{self.po_filepath}",'
-            f' po_msgids=[...{len(self.po_msgids)} msgids...],'
-            ' translated_msgstrs=['
-            f'...{len(self.translated_msgstrs)} msgstrs...],'
-            f' translated_msgids=[...{len(self.translated_msgids)} msgids...],'
-            f' disabled_msgids=[...{len(self.disabled_msgids)} msgids...]'
+            f' po_msgids={{...{len(self.po_msgids)} msgids...}},'
+            ' translated_msgstrs={'
+            f'...{len(self.translated_msgstrs)} msgstrs...}},'
+            ' translated_msgids={'
+            f'...{len(self.translated_msgids)} msgids...}},'
+            f' disabled_msgids={{...{len(self.disabled_msgids)} msgids...}}'
             ')'
         )
 
@@ -48,16 +238,31 @@ class Translations:
     __slots__ = {
         'files',
         'tempdir',
-        'nav',
-        'compendium_files',
+        'navs',
+        'compendiums',
         'compendium_msgids',
         'compendium_msgstrs_tr',
         'current',
         'all',
         'locations',
+        'search_patcher',
         'stats',
+        'excluded_languages',
+        'pofiles',
+        'original_pofiles',
         'config_settings',
+        'configs',
         'page_metas',
+        'dirty_pofiles',
+        'pending_pages',
+        'untranslated_pages',
+        'excluded_translations',
+        'original_markdown',
+        'original_po',
+        'original_tree',
+        'original_msgids',
+        'original_title_msgids',
+        'rendered_tree',
     }
 
     def __init__(self):
@@ -68,17 +273,19 @@ class Translations:
         # temporal directory to store temporal translation files
         self.tempdir = tempfile.TemporaryDirectory(prefix='mkdocs_mdpo_')
 
-        # navigation translation
-        # {original_title: {lang: {title: [translation, url]}}}
-        self.nav = {}
+        # translated navigations, built once per language, whose pages are
+        # the translated ones (see `on_page_context` event)
+        # {lang: mkdocs.structure.nav.Navigation(...)}
+        self.navs = {}
 
-        # {lang: compendium_filepath}
-        self.compendium_files = {}
+        # compendiums loaded in memory during the build, saved at the end
+        # {lang: IndexedPOFile(...)}
+        self.compendiums = {}
 
-        # {lang: [msgids]}
+        # {lang: {msgids}}
         self.compendium_msgids = {}
 
-        # {lang: [msgstrs]}
+        # {lang: {msgstrs}}
         self.compendium_msgstrs_tr = {}
 
         # translations of current page being built
@@ -93,24 +300,132 @@ class Translations:
         # {location: language}
         self.locations = {}
 
-        # translations statistics for each language
+        # patcher of the site directory used to restrict the search to
+        # the language of each page, created when the first HTML file is
+        # written if 'cross_language_search' is disabled
+        # TranslationsSearchPatcher(...)
+        self.search_patcher = None
+
+        # translations statistics for each language, computed from their
+        # PO files before rendering if ``min_translated_messages`` is defined
         # {lang: {total: int, translated: int}}
         self.stats = {}
 
+        # languages excluded from the build because they don't have the
+        # minimum number of translated messages, their pages are not
+        # rendered but their PO files are updated
+        self.excluded_languages = []
+
+        # PO files of pages loaded to compute the statistics of languages,
+        # used when the pages are translated
+        # {fpath: IndexedPOFile(...)}
+        self.pofiles = {}
+
+        # Markdown content, extractor and PO file extracted from the source
+        # of pages to compute the statistics of languages, used when the
+        # pages are translated
+        # {src_path: (str, mdpo.md2po.Md2Po(...), polib.POFile(...))}
+        self.original_pofiles = {}
+
         # config settings translations (site_name, site_description)
         # {lang: {site_name: str, site_description: str}}
         self.config_settings = {}
 
+        # Mkdocs configurations with the config settings translated, used
+        # to render the pages of each language
+        # {lang: mkdocs.config.base.Config(...)}
+        self.configs = {}
+
         # translated page metadatas by language
         # {lang: {page.file.src_path: {...meta...}}}
         self.page_metas = {}
 
+        # PO files pending to be written at the end of the build, ``None``
+        # values mean that the file must be removed
+        # {fpath: IndexedPOFile(...)}
+        self.dirty_pofiles = {}
+
+        # translated pages of the current page waiting to be rendered from
+        # the tree of the original one, when 'render_from_original_tree'
+        # is enabled
+        # [(Page(...), Translation(...), {required_msgids}), ...]
+        self.pending_pages = []
+
+        # excluded or untranslated pages of the current page waiting to be
+        # rendered from the rendered tree of the original one
+        # [(Page(...), Translation(...)), ...]
+        self.untranslated_pages = []
+
+        # translations of the current page in the languages excluded from
+        # the build, waiting to be updated with the msgids found by the tree
+        # processors in the original page
+        # [Translation(...), ...]
+        self.excluded_translations = []
+
+        # Markdown content of the current original page returned by the
+        # plugin, to check that is the rendered one
+        self.original_markdown = None
+
+        # PO file extracted from the Markdown content of the current
+        # original page, if the PO files of the languages excluded from the
+        # build must be updated with the msgids of its extensions
+        self.original_po = None
+
+        # Markdown instance, tree of the current original page before
+        # inline processing and state of its extensions, ``False`` if it
+        # can't be used
+        # (markdown.Markdown(...), xml.etree.ElementTree.Element(...), [...])
+        self.original_tree = None
+
+        # msgids of the texts of the current original page, in order,
+        # ``False`` if they can't be used
+        self.original_msgids = None
+
+        # msgids of the titles of the current original page, in order,
+        # ``False`` if they can't be used
+        self.original_title_msgids = None
+
+        # Markdown instance, rendered tree and table of contents tokens of
+        # the current original page, ``False`` if it can't be used
+        # (markdown.Markdown(...), xml.etree.ElementTree.Element(...), [...])
+        self.rendered_tree = None
+
+    def mark_dirty(self, pofile, fpath=None):
+        """Mark a PO file to be written when the build finishes.
+
+        Args:
+            pofile (IndexedPOFile): PO file to write. If ``None``, the file
+                will be removed.
+            fpath (str): Path to the file, by default the one of the PO
+                file.
+        """
+        self.dirty_pofiles[fpath or pofile.fpath] = pofile
+
+    def flush_pofiles(self):
+        """Write all the PO files marked as dirty, each one only once.
+
+        The files are written in parallel and atomically, so if the writing
+        of a file fails its previous version is preserved.
+        """
+        def _flush(item):
+            fpath, pofile = item
+            if pofile is not None:
+                save_pofile(pofile, fpath)
+            elif os.path.isfile(fpath):
+                os.remove(fpath)
+
+        dirty_pofiles, self.dirty_pofiles = self.dirty_pofiles, {}
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            # consume the results to raise the errors, if any
+            for _ in executor.map(_flush, dirty_pofiles.items()):
+                pass
+
     def __str__(self):  # pragma: no cover
         current = 'None' if self.current is None else 'Translation(...)'
         return (
             f'Translations(tempdir="{self.tempdir}",'
-            f' files={str(self.files)}, nav={str(self.nav)},'
-            f' compendium_files={str(self.compendium_files)},'
+            f' files={str(self.files)}, navs={str(list(self.navs))},'
+            f' compendiums={str(list(self.compendiums))},'
             f' compendium_msgids={str(self.compendium_msgids)},'
             ' compendium_msgstrs_tr='
             f'{str(self.compendium_msgstrs_tr)},'
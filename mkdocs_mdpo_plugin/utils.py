@@ -1,4 +1,15 @@
 import functools
+import os
+import re
+
+import jinja2
+
+
+# placeholders of simple Jinja2 templates which can be rendered without
+# Jinja2, like '{{language}}' or '{{file.dest_path}}'
+SIMPLE_TEMPLATE_PLACEHOLDER_RE = re.compile(
+    r'{{\s*([A-Za-z_]\w*)(?:\.([A-Za-z_]\w*))?\s*}}',
+)
 
 
 def readable_float(number):
@@ -22,17 +33,78 @@ def removesuffix(s, suf):
     return s
 
 
-def po_messages_stats(po):
-    untranslated_messages, total_messages = 0, 0
+def text_file_has_content(filepath, content, encoding='utf-8'):
+    """Check if a file contains a text, as it would be written opening the
+    file in text mode.
+
+    The sizes are compared before reading the file, so most of the changed
+    files are detected without reading them.
+
+    Args:
+        filepath (str): Path to the file.
+        content (str): Text to compare with the content of the file.
+        encoding (str): Encoding of the file.
+    """
+    data = content.replace('\n', os.linesep).encode(encoding)
+    try:
+        if os.path.getsize(filepath) != len(data):
+            return False
+        with open(filepath, 'rb') as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+def build_dest_filename_renderer(template, plugin_config):
+    """Build a function which renders the ``dest_filename_template`` of the
+    plugin for a file and a language.
+
+    Templates which only include ``{{language}}``, ``{{file.<attribute>}}``
+    or ``{{<setting>}}`` placeholders are rendered with plain string
+    operations. Other templates are compiled by Jinja2 once.
+
+    Args:
+        template (str): Jinja2 template.
+        plugin_config (dict): Plugin configuration, included in the context
+            of the template.
+
+    Returns:
+        function: Function that accepts the file and the language as
+        arguments and returns the rendered template.
+    """
+    # [literal, name, attribute, literal, name, attribute, ..., literal]
+    parts = SIMPLE_TEMPLATE_PLACEHOLDER_RE.split(template)
+    literals, getters = (parts[::3], [])
+    for name, attr in zip(parts[1::3], parts[2::3]):
+        if name == 'file' and attr:
+            getters.append(
+                lambda file, language, attr=attr: str(getattr(file, attr, '')),
+            )
+        elif name == 'language' and not attr:
+            getters.append(lambda file, language: language)
+        elif name in plugin_config and not attr:
+            # settings are constant during the build
+            getters.append(
+                lambda file, language, value=str(plugin_config[name]): value,
+            )
+        else:
+            break
+    else:
+        if not any(char in ''.join(literals) for char in '{}%#\n'):
+            def render(file, language):
+                result = literals[0]
+                for getter, literal in zip(getters, literals[1:]):
+                    result += getter(file, language) + literal
+                return result
+            return render
+
+    jinja2_template = jinja2.Template(template)
 
-    for entry in po:
-        total_messages += 1
-        if not entry.msgstr and not entry.obsolete:
-            untranslated_messages += 1
-    return (
-        total_messages - untranslated_messages,
-        total_messages,
-    )
+    def render(file, language):
+        context = {'file': file, 'language': language}
+        context.update(plugin_config)
+        return jinja2_template.render(**context)
+    return render
 
 
 @functools.lru_cache(maxsize=None)
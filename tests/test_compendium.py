@@ -2,8 +2,12 @@
 
 import os
 
+import polib
 import pytest
 
+import mkdocs_mdpo_plugin.translations
+from mkdocs_mdpo_plugin.translations import IndexedPOFile
+
 
 TESTS = (
     pytest.param(
@@ -41,6 +45,42 @@ TESTS = (
         '#\nmsgid ""\nmsgstr ""\n\nmsgid "Hello"\nmsgstr ""\n',
         id='repeated-messages-in-different-files',
     ),
+    pytest.param(
+        {
+            'index.md': 'Bye\n\nHello\n\nFoo\n',
+            'secondary.md': 'Foo\n\nBye\n\nBar\n\nHello\n',
+        },
+        {
+            'es/_compendium.po': {
+                'Hello': 'Hola',
+                'Bye': 'Adiós',
+                'Foo': 'Foo es',
+            },
+            'es/secondary.md.po': {
+                'Secondary': 'Secundaria',
+                'Bar': 'Bar es',
+            },
+        },
+        {'languages': ['en', 'es']},
+        {
+            'nav': [
+                {'Home': 'index.md'},
+                {'Secondary': 'secondary.md'},
+            ],
+        },
+        {
+            'es/index.html': ['<p>Adiós</p>\n<p>Hola</p>\n<p>Foo es</p>'],
+            'es/secondary/index.html': [
+                '<p>Foo es</p>\n<p>Adiós</p>\n<p>Bar es</p>\n<p>Hola</p>',
+            ],
+        },
+        # dumped in the order they are found repeated
+        (
+            '#\nmsgid ""\nmsgstr ""\n\nmsgid "Foo"\nmsgstr ""\n\n'
+            'msgid "Bye"\nmsgstr ""\n\nmsgid "Hello"\nmsgstr ""\n'
+        ),
+        id='multiple-repeated-messages-in-different-files',
+    ),
 )
 
 
@@ -88,3 +128,80 @@ def test_repeated_messages_to_compendium(
         callback_after_first_build=after_first_build,
         interrupt_after_first_build=expected_compendium_content is None,
     )
+
+
+def test_compendium_loaded_once_per_build(mkdocs_build, monkeypatch):
+    """The compendium of each language is parsed once per build and shared
+    by all its pages, without their changes leaking into it.
+    """
+    compendium_loads = []
+    original_pofile = polib.pofile
+
+    def pofile(pofile, *args, **kwargs):
+        # PO files are loaded by the plugin as indexed ones
+        if (
+            str(pofile).endswith('_compendium.po') and
+            kwargs.get('klass') is IndexedPOFile
+        ):
+            compendium_loads.append(os.path.basename(os.path.dirname(pofile)))
+        return original_pofile(pofile, *args, **kwargs)
+
+    saved_pofiles = {}
+    original_save_pofile = mkdocs_mdpo_plugin.translations.save_pofile
+
+    def save_pofile(pofile, fpath):
+        language_dir, filename = os.path.split(fpath)
+        saved_pofiles[(os.path.basename(language_dir), filename)] = pofile
+        return original_save_pofile(pofile, fpath)
+
+    monkeypatch.setattr(polib, 'pofile', pofile)
+    monkeypatch.setattr(
+        mkdocs_mdpo_plugin.translations,
+        'save_pofile',
+        save_pofile,
+    )
+
+    def after_first_build(context):
+        # no compendiums to load in the first build
+        assert compendium_loads == []
+
+    mkdocs_build(
+        {
+            'index.md': 'Hello\n\nFoo\n',
+            'secondary.md': 'Hello\n\nBar\n',
+            'tertiary.md': 'Hello\n\nBaz\n',
+        },
+        {
+            'es/_compendium.po': {'Hello': 'Hola'},
+            'fr/_compendium.po': {'Hello': 'Salut'},
+        },
+        {'languages': ['en', 'es', 'fr']},
+        {
+            'nav': [
+                {'Home': 'index.md'},
+                {'Secondary': 'secondary.md'},
+                {'Tertiary': 'tertiary.md'},
+            ],
+        },
+        {
+            'es/index.html': ['<p>Hola</p>'],
+            'es/secondary/index.html': ['<p>Hola</p>'],
+            'es/tertiary/index.html': ['<p>Hola</p>'],
+            'fr/index.html': ['<p>Salut</p>'],
+            'fr/secondary/index.html': ['<p>Salut</p>'],
+            'fr/tertiary/index.html': ['<p>Salut</p>'],
+        },
+        callback_after_first_build=after_first_build,
+        allow_missing_translations=True,
+    )
+
+    assert sorted(compendium_loads) == ['es', 'fr']
+
+    # the compendium entries added temporally to the PO files of the pages
+    # are not saved with them
+    assert ('es', 'secondary.md.po') in saved_pofiles
+    for (language, filename), po in saved_pofiles.items():
+        if filename != '_compendium.po':
+            assert 'Hello' not in po.msgid_entries, (
+                f"Found 'Hello' in PO file '{language}/{filename}'"
+            )
@@ -4,6 +4,9 @@ import os
 
 import pytest
 
+import mkdocs_mdpo_plugin.translations
+from mkdocs_mdpo_plugin.plugin import MdpoPlugin
+
 
 TESTS = (
     pytest.param(
@@ -137,7 +140,21 @@ def test_min_translated_messages(
     expected_first_build_log,
     expected_second_build_log,
     mkdocs_build,
+    monkeypatch,
 ):
+    rendered_pages = []
+    original_populate_translated_page = MdpoPlugin._populate_translated_page
+
+    def _populate_translated_page(self, page, *args, **kwargs):
+        rendered_pages.append(page.file.url)
+        return original_populate_translated_page(self, page, *args, **kwargs)
+
+    monkeypatch.setattr(
+        MdpoPlugin,
+        '_populate_translated_page',
+        _populate_translated_page,
+    )
+
     def check_translated_files_not_exists(context):
         es_path = os.path.join(context['site_dir'], 'es')
         es_index_path = os.path.join(es_path, 'index.html')
@@ -161,3 +178,71 @@ def test_min_translated_messages(
     assert expected_second_build_log in (
         plugin_log.split(expected_first_build_log)[-1]  # after first build log
     )
+
+    # the pages of the excluded language are not rendered
+    assert rendered_pages == []
+
+
+def test_min_translated_messages_extensions_msgids(
+    mkdocs_build,
+    monkeypatch,
+):
+    """The msgids handled by the extensions are kept in the PO files of the
+    excluded languages, although their pages are not rendered.
+    """
+    saved_pofiles = {}
+    original_save_pofile = mkdocs_mdpo_plugin.translations.save_pofile
+
+    def save_pofile(pofile, fpath):
+        saved_pofiles[os.path.basename(fpath)] = pofile
+        return original_save_pofile(pofile, fpath)
+
+    monkeypatch.setattr(
+        mkdocs_mdpo_plugin.translations,
+        'save_pofile',
+        save_pofile,
+    )
+
+    _, plugin_log = mkdocs_build(
+        {
+            'index.md': (
+                '# Index\n\nHello [link](foo.md "Link title")\n\n'
+                '!!! note "Note title"\n\n    Note body\n'
+            ),
+            'foo.md': '# Foo\n\nSome __bold__ text\n',
+        },
+        {
+            'es/index.md.po': {
+                'Note title': 'Título de la nota',
+                'Note body': 'Cuerpo de la nota',
+                'Link title': 'Título del enlace',
+            },
+        },
+        {
+            'languages': ['en', 'es'],
+            'min_translated_messages': 100,
+        },
+        {'markdown_extensions': ['admonition']},
+        {'index.html': ['<p class="admonition-title">Note title</p>']},
+        allow_missing_translations=True,
+    )
+    assert 'Excluding language "es"' in plugin_log
+
+    # PO files written by the second build
+    assert {
+        entry.msgid: entry.msgstr for entry in saved_pofiles['index.md.po']
+        if not entry.obsolete
+    } == {
+        'Index': '',
+        'Hello [link](foo.md "Link title")': '',
+        'Note title': 'Título de la nota',
+        'Note body': 'Cuerpo de la nota',
+        'Link title': 'Título del enlace',
+    }
+
+    # the text of the original page is written differently in the
+    # translated content, so only the msgid of the latter is added
+    assert [entry.msgid for entry in saved_pofiles['foo.md.po']] == [
+        'Foo',
+        'Some **bold** text',
+    ]
@@ -482,6 +482,51 @@ def test_plugin_config(
             None,
             id='min_translated_messages=45',
         ),
+        pytest.param(
+            {
+                'search_index_shard_size': 0,
+                'languages': [
+                    'en',
+                    'es',
+                ],
+            },
+            {},
+            mkdocs.config.base.ValidationError,
+            (
+                "The value '0' for 'search_index_shard_size'"
+                ' config setting is not a positive number of bytes.'
+            ),
+            id='search_index_shard_size=0',
+        ),
+        pytest.param(
+            {
+                'search_index_shard_size': -100,
+                'languages': [
+                    'en',
+                    'es',
+                ],
+            },
+            {},
+            mkdocs.config.base.ValidationError,
+            (
+                "The value '-100' for 'search_index_shard_size'"
+                ' config setting is not a positive number of bytes.'
+            ),
+            id='search_index_shard_size=-100',
+        ),
+        pytest.param(
+            {
+                'search_index_shard_size': 500000,
+                'languages': [
+                    'en',
+                    'es',
+                ],
+            },
+            {},
+            None,
+            None,
+            id='search_index_shard_size=500000',
+        ),
         pytest.param(
             {
                 'exclude': 45,
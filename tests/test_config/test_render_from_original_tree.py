@@ -0,0 +1,265 @@
+"""Tests for 'render_from_original_tree' config setting."""
+
+import pytest
+
+import mkdocs_mdpo_plugin.plugin
+from mkdocs_mdpo_plugin.plugin import MdpoPlugin
+
+
+INPUT_FILES_CONTENTS = {
+    'index.md': '''# Title
+
+Hello [link](foo.md) and `code` with **bold**.
+
+- Item 1
+- Item 2
+
+| Name | Value |
+| --- | --- |
+| Baz | Qux |
+''',
+    'foo.md': '''# Foo
+
+Some text.
+''',
+    'bar.md': '''Paragraph with __bold__
+
+Another paragraph
+''',
+}
+
+TRANSLATIONS = {
+    'es/index.md.po': {
+        'Title': 'Título',
+        'Hello [link](foo.md) and `code` with **bold**.': (
+            'Hola [enlace](foo.md) y `código` con **negrita**.'
+        ),
+        'Item 1': 'Elemento 1',
+        'Item 2': 'Elemento 2',
+        'Name': 'Nombre',
+        'Value': 'Valor',
+        'Baz': 'Baz es',
+        'Qux': 'Qux es',
+    },
+    'es/foo.md.po': {
+        'Foo': 'Foo es',
+        'Some text.': 'Algo de texto.',
+    },
+    # msgid differs from the text of the page in the tree
+    'es/bar.md.po': {
+        'Bar': 'Bar es',
+        'Paragraph with **bold**': 'Párrafo con **negrita**',
+        'Another paragraph': 'Otro párrafo',
+    },
+}
+
+
+def _build_translated_pages(mkdocs_build, monkeypatch, plugin_config):
+    outputs, tree_renders = {}, []
+
+    original_on_post_page = MdpoPlugin.on_post_page
+
+    def on_post_page(self, output, page, config):
+        if hasattr(page.file, '_mdpo_language'):
+            outputs[page.url] = (output, str(page.toc))
+        return original_on_post_page(self, output, page, config)
+
+    monkeypatch.setattr(MdpoPlugin, 'on_post_page', on_post_page)
+
+    original_render_translated_tree = (
+        mkdocs_mdpo_plugin.plugin.render_translated_tree
+    )
+
+    def render_translated_tree(*args, **kwargs):
+        content = original_render_translated_tree(*args, **kwargs)
+        tree_renders.append(content is not None)
+        return content
+
+    monkeypatch.setattr(
+        mkdocs_mdpo_plugin.plugin,
+        'render_translated_tree',
+        render_translated_tree,
+    )
+
+    mkdocs_build(
+        INPUT_FILES_CONTENTS,
+        TRANSLATIONS,
+        {
+            'languages': ['en', 'es'],
+            'translated_files_in_memory': True,
+            **plugin_config,
+        },
+        {'markdown_extensions': ['tables', 'toc']},
+        {
+            'es/index.html': [
+                '<h1 id="titulo">Título</h1>',
+                'y <code>código</code> con <strong>negrita</strong>.</p>',
+                '<li>Elemento 1</li>',
+                '<td>Baz es</td>',
+            ],
+            'es/foo/index.html': ['<h1 id="foo-es">Foo es</h1>'],
+            'es/bar/index.html': [
+                '<p>Párrafo con <strong>negrita</strong></p>',
+            ],
+        },
+    )
+    return outputs, tree_renders
+
+
+@pytest.mark.parametrize('translated_files_in_memory', (True, False))
+def test_render_from_original_tree(
+    translated_files_in_memory,
+    mkdocs_build,
+    monkeypatch,
+):
+    plugin_config = {'translated_files_in_memory': translated_files_in_memory}
+    expected_outputs, tree_renders = _build_translated_pages(
+        mkdocs_build,
+        monkeypatch,
+        plugin_config,
+    )
+    assert tree_renders == []
+
+    outputs, tree_renders = _build_translated_pages(
+        mkdocs_build,
+        monkeypatch,
+        {**plugin_config, 'render_from_original_tree': True},
+    )
+    assert outputs == expected_outputs
+    assert outputs
+
+    # 'bar.md' is rendered from its content because a translated msgid
+    # is not found in the tree, the others are rendered from the tree of
+    # the original page (the first build has no translations, so its pages
+    # are rendered from the rendered tree of their original pages)
+    assert tree_renders == [True, False, True]
+
+
+def test_render_from_original_tree_compendium(mkdocs_build, monkeypatch):
+    tree_renders = []
+
+    original_render_translated_tree = (
+        mkdocs_mdpo_plugin.plugin.render_translated_tree
+    )
+
+    def render_translated_tree(*args, **kwargs):
+        content = original_render_translated_tree(*args, **kwargs)
+        tree_renders.append(content is not None)
+        return content
+
+    monkeypatch.setattr(
+        mkdocs_mdpo_plugin.plugin,
+        'render_translated_tree',
+        render_translated_tree,
+    )
+
+    # 'Shared' is moved to the compendium in the first build, but is added
+    # again untranslated to the PO files of the pages in the second one,
+    # so its translation is taken from the compendium
+    mkdocs_build(
+        {
+            'index.md': '# Index\n\nShared\n\nIndex text\n',
+            'foo.md': '# Foo\n\nShared\n\nFoo text\n',
+        },
+        {
+            'es/index.md.po': {
+                'Index': 'Índice',
+                'Index text': 'Texto del índice',
+            },
+            'es/foo.md.po': {
+                'Foo': 'Foo es',
+                'Foo text': 'Texto de foo',
+            },
+            'es/_compendium.po': {'Shared': 'Shared ES'},
+        },
+        {
+            'languages': ['en', 'es'],
+            'render_from_original_tree': True,
+            'cross_language_search': False,
+        },
+        {'plugins': [{'search': {}}]},
+        {
+            'es/index.html': [
+                '<p>Shared ES</p>',
+                '<p>Texto del índice</p>',
+            ],
+            'es/foo/index.html': [
+                '<p>Shared ES</p>',
+                '<p>Texto de foo</p>',
+            ],
+            'search/search_index_es.json': ['Shared ES'],
+        },
+    )
+    assert tree_renders == [True, True]
+
+
+def test_render_from_original_tree_footnotes(mkdocs_build, monkeypatch):
+    """The state of the Markdown extensions for the original page is
+    restored before rendering each translated page from its tree.
+    """
+    def build(plugin_config):
+        outputs, tree_renders = {}, []
+
+        original_on_post_page = MdpoPlugin.on_post_page
+
+        def on_post_page(self, output, page, config):
+            if hasattr(page.file, '_mdpo_language'):
+                outputs[page.url] = output
+            return original_on_post_page(self, output, page, config)
+
+        monkeypatch.setattr(MdpoPlugin, 'on_post_page', on_post_page)
+
+        original_render_translated_tree = (
+            mkdocs_mdpo_plugin.plugin.render_translated_tree
+        )
+
+        def render_translated_tree(*args, **kwargs):
+            content = original_render_translated_tree(*args, **kwargs)
+            tree_renders.append(content is not None)
+            return content
+
+        monkeypatch.setattr(
+            mkdocs_mdpo_plugin.plugin,
+            'render_translated_tree',
+            render_translated_tree,
+        )
+
+        mkdocs_build(
+            {
+                'index.md': (
+                    '# Title\n\nHello world[^1] and more[^1].\n\n'
+                    '[^1]: A footnote.\n'
+                ),
+            },
+            {
+                'es/index.md.po': {
+                    'Title': 'Título',
+                    'Hello world[^1] and more[^1].': (
+                        'Hola mundo[^1] y más[^1].'
+                    ),
+                    'Jump back to footnote 1 in the text': (
+                        'Volver a la nota 1 en el texto'
+                    ),
+                },
+            },
+            {
+                'languages': ['en', 'es', 'fr'],
+                **plugin_config,
+            },
+            {'markdown_extensions': ['footnotes']},
+            {
+                'es/index.html': [
+                    'Hola mundo<sup id="fnref:1">',
+                    'y más<sup id="fnref2:1">',
+                ],
+            },
+            allow_missing_translations=True,
+        )
+        return outputs, tree_renders
+
+    expected_outputs, tree_renders = build({})
+    assert tree_renders == []
+
+    outputs, tree_renders = build({'render_from_original_tree': True})
+    assert tree_renders == [True]
+    assert outputs == expected_outputs
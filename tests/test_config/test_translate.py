@@ -4,6 +4,8 @@ import os
 
 import pytest
 
+from mkdocs_mdpo_plugin.plugin import MdpoPlugin
+
 
 @pytest.mark.parametrize(
     (
@@ -191,10 +193,14 @@ def test_translate_dumped_to_compendium(
                 'site_name': 'The name of the site',
             },
             {
+                'index.html': [
+                    '<p>Hello</p>',
+                    'The name of the site</title>',
+                ],
                 'es/index.html': [
                     '<p>Hola</p>',
                     '<p>Adiós</p>',
-                    'El nombre del sitio',
+                    'El nombre del sitio</title>',
                 ],
             },
             id='translate=[site_name]',
@@ -227,7 +233,10 @@ def test_translate_dumped_to_compendium(
                     '<p>Hola</p>',
                     '<p>Adiós</p>',
                     'The name of the site',
-                    'La descripción del sitio',
+                    (
+                        '<meta name="description"'
+                        ' content="La descripción del sitio"'
+                    ),
                 ],
             },
             id='translate=[site_description]-theme=mkdocs',
@@ -263,7 +272,10 @@ def test_translate_dumped_to_compendium(
                     '<p>Hola</p>',
                     '<p>Adiós</p>',
                     'The name of the site',
-                    'La descripción del sitio',
+                    (
+                        '<meta name="description"'
+                        ' content="La descripción del sitio"'
+                    ),
                 ],
             },
             id='translate=[site_description]-theme=material',
@@ -300,11 +312,70 @@ def test_translate_dumped_to_compendium(
                     '<p>Hola</p>',
                     '<p>Adiós</p>',
                     'El nombre del sitio',
-                    'La descripción del sitio',
+                    (
+                        '<meta name="description"'
+                        ' content="La descripción del sitio"'
+                    ),
                 ],
             },
             id='translate=[site_name,site_description]',
         ),
+        pytest.param(
+            {
+                'index.md': 'Hello\n',
+                'foo.md': '# Foo\n\nBye\n',
+            },
+            {
+                'es/index.md.po': {
+                    'Hello': 'Hola',
+                },
+                'es/foo.md.po': {
+                    'Foo': 'Foo es',
+                    'Bye': 'Adiós',
+                },
+                'es/_compendium.po': {
+                    'The name of the site': 'El nombre del sitio',
+                },
+                'fr/index.md.po': {
+                    'Hello': 'Salut',
+                },
+                'fr/foo.md.po': {
+                    'Foo': 'Foo fr',
+                    'Bye': 'Adieu',
+                },
+                'fr/_compendium.po': {
+                    'The name of the site': 'Le nom du site',
+                },
+            },
+            {
+                'languages': ['en', 'es', 'fr'],
+                'translate': ['site_name'],
+            },
+            {
+                'site_name': 'The name of the site',
+            },
+            {
+                'index.html': [
+                    '<title>The name of the site</title>',
+                ],
+                'foo/index.html': [
+                    '<title>Foo - The name of the site</title>',
+                ],
+                'es/index.html': [
+                    '<title>Home - El nombre del sitio</title>',
+                ],
+                'es/foo/index.html': [
+                    '<title>Foo es - El nombre del sitio</title>',
+                ],
+                'fr/index.html': [
+                    '<title>Home - Le nom du site</title>',
+                ],
+                'fr/foo/index.html': [
+                    '<title>Foo fr - Le nom du site</title>',
+                ],
+            },
+            id='translate=[site_name]-languages[en,es,fr]',
+        ),
     ),
 )
 def test_translate_html_output(
@@ -322,3 +393,85 @@ def test_translate_html_output(
         additional_config,
         expected_output_files,
     )
+
+
+def test_translate_resolved_once_per_language(mkdocs_build, monkeypatch):
+    """The translations of the config settings are resolved once for each
+    language and their msgids are handled by all the pages.
+    """
+    resolved_settings, translated_msgids = {}, {}
+    original_translate_config_settings = (
+        MdpoPlugin._translate_config_settings
+    )
+    original_on_post_build = MdpoPlugin.on_post_build
+
+    def _translate_config_settings(self, language, compendium_pofile, config):
+        resolved = language in self.translations.config_settings
+        settings = original_translate_config_settings(
+            self,
+            language,
+            compendium_pofile,
+            config,
+        )
+        resolved_settings.setdefault(language, []).append(
+            (resolved, settings),
+        )
+        return settings
+
+    def on_post_build(self, config):
+        for language, translations in self.translations.all.items():
+            translated_msgids[language] = [
+                translation.translated_msgids for translation in translations
+            ]
+        return original_on_post_build(self, config)
+
+    monkeypatch.setattr(
+        MdpoPlugin,
+        '_translate_config_settings',
+        _translate_config_settings,
+    )
+    monkeypatch.setattr(MdpoPlugin, 'on_post_build', on_post_build)
+
+    mkdocs_build(
+        {
+            'index.md': 'Hello\n',
+            'foo.md': 'Foo\n',
+            'bar.md': 'Bar\n',
+        },
+        {
+            'es/_compendium.po': {
+                'The name of the site': 'El nombre del sitio',
+            },
+            'fr/_compendium.po': {
+                'The name of the site': 'Le nom du site',
+            },
+        },
+        {
+            'languages': ['en', 'es', 'fr'],
+            'translate': ['site_name'],
+        },
+        {
+            'site_name': 'The name of the site',
+        },
+        {
+            'es/bar/index.html': ['Bar - El nombre del sitio</title>'],
+            'fr/bar/index.html': ['Bar - Le nom du site</title>'],
+        },
+        allow_missing_translations=True,
+    )
+
+    for language, expected_msgstr in (
+        ('es', 'El nombre del sitio'),
+        ('fr', 'Le nom du site'),
+    ):
+        # resolved for the first page of each build, reused by the others
+        assert [resolved for resolved, _ in resolved_settings[language]] == [
+            False, True, True,
+        ] * 2
+        # translated in the second build
+        for _, settings in resolved_settings[language][3:]:
+            assert settings == {'site_name': expected_msgstr}
+
+        assert len(translated_msgids[language]) == 3
+        for page_translated_msgids in translated_msgids[language]:
+            assert 'The name of the site' in page_translated_msgids
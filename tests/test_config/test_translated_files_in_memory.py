@@ -0,0 +1,61 @@
+"""Tests for 'translated_files_in_memory' config setting."""
+
+import os
+
+import pytest
+
+from mkdocs_mdpo_plugin.plugin import MdpoPlugin
+
+
+@pytest.mark.parametrize('translated_files_in_memory', (True, False))
+def test_translated_files_in_memory(
+    translated_files_in_memory,
+    mkdocs_build,
+    monkeypatch,
+):
+    read_sources = []
+    original_on_page_read_source = MdpoPlugin.on_page_read_source
+
+    def on_page_read_source(self, page, config):
+        source = original_on_page_read_source(self, page, config)
+        if hasattr(page.file, '_mdpo_language'):
+            read_sources.append(
+                (source, os.path.isfile(page.file.abs_src_path)),
+            )
+        return source
+
+    monkeypatch.setattr(
+        MdpoPlugin,
+        'on_page_read_source',
+        on_page_read_source,
+    )
+
+    mkdocs_build(
+        {
+            'index.md': 'Hello\n\nBye',
+        },
+        {
+            'es/index.md.po': {
+                'Hello': 'Hola',
+                'Bye': 'Adiós',
+            },
+        },
+        {
+            'languages': ['en', 'es'],
+            'translated_files_in_memory': translated_files_in_memory,
+        },
+        {},
+        {
+            'es/index.html': [
+                '<p>Hola</p>',
+                '<p>Adiós</p>',
+            ],
+        },
+    )
+
+    # first and second builds
+    assert len(read_sources) == 2
+    if translated_files_in_memory:
+        assert read_sources[-1] == ('Hola\n\nAdiós\n', False)
+    else:
+        assert read_sources[-1] == (None, True)
@@ -0,0 +1,59 @@
+"""Tests for the tree processors of the 'mkdocs-mdpo' extension."""
+
+import sys
+import xml.etree.ElementTree as etree
+
+import polib
+
+from mkdocs_mdpo_plugin.extensions import (
+    MkdocsMdpoTitlesTreeProcessor,
+    MkdocsMdpoTreeProcessor,
+)
+from mkdocs_mdpo_plugin.mkdocs_utils import MkdocsBuild
+from mkdocs_mdpo_plugin.plugin import MdpoPlugin
+from mkdocs_mdpo_plugin.translations import IndexedPOFile, Translation
+
+
+def test_translate_tree_deeper_than_recursion_limit():
+    # the Markdown parser and serializer are recursive, so the tree is
+    # built as it would be found by the tree processors of a page with
+    # nested blockquotes
+    depth = sys.getrecursionlimit() + 100
+
+    root = etree.Element('div')
+    parent = root
+    for _ in range(depth):
+        parent = etree.SubElement(parent, 'blockquote')
+    paragraph = etree.SubElement(parent, 'p')
+    paragraph.text = 'Hello'
+    link = etree.SubElement(paragraph, 'a', title='Link title')
+    link.text = 'link'
+
+    po = IndexedPOFile()
+    for msgid, msgstr in (
+        ('Hello', 'Hola'),
+        ('link', 'enlace'),
+        ('Link title', 'Título del enlace'),
+    ):
+        po.append(polib.POEntry(msgid=msgid, msgstr=msgstr))
+
+    MkdocsBuild._instance = None
+    try:
+        plugin = MdpoPlugin()
+        plugin.translations.current = Translation(
+            'es', po, None, set(), set(), set(),
+        )
+
+        MkdocsMdpoTreeProcessor().run(root)
+        MkdocsMdpoTitlesTreeProcessor().run(root)
+    finally:
+        MkdocsBuild._instance = None
+
+    assert paragraph.text == 'Hola'
+    assert link.text == 'enlace'
+    assert link.attrib['title'] == 'Título del enlace'
+    assert plugin.translations.current.translated_msgids == {
+        'Hello',
+        'link',
+        'Link title',
+    }
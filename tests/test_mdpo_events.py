@@ -0,0 +1,22 @@
+"""Tests for mdpo events of mkdocs-mdpo-plugin."""
+
+from mkdocs_mdpo_plugin.mdpo_events import build_md2po_events
+
+
+def test_build_md2po_events():
+    events = build_md2po_events(['toc', 'admonition', 'pymdownx.tabbed'])
+
+    # events are built only once for the same extensions
+    assert events is build_md2po_events(
+        ['pymdownx.tabbed', 'admonition', 'tables'],
+    )
+    assert 'text' not in build_md2po_events(['toc'])
+
+    class FakeMd2Po:
+        disabled_entries = []
+
+    md2po = FakeMd2Po()
+    assert events['text'](md2po, None, '!!! note "Title"') is False
+    assert events['text'](md2po, None, '=== "Tab"') is False
+    assert events['text'](md2po, None, 'Hello') is None
+    assert md2po.disabled_entries == ['!!! note "Title"', '=== "Tab"']
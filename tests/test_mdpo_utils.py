@@ -0,0 +1,126 @@
+"""Tests for mdpo utilities of mkdocs-mdpo-plugin."""
+
+import os
+
+import polib
+from mdpo.po2md import Po2Md
+
+import mkdocs_mdpo_plugin.translations
+from mkdocs_mdpo_plugin.mdpo_utils import (
+    parse_md4c_events,
+    po2md_from_pofiles,
+    translate_md4c_events,
+)
+from mkdocs_mdpo_plugin.plugin import MdpoPlugin
+
+
+MARKDOWN = '''# Title
+
+Hello [link][ref] and `code`.
+
+- Item **bold**
+- Item *italic*
+
+<!-- mdpo-disable-next-line -->
+Not translated
+
+| Foo | Bar |
+| --- | --- |
+| Baz | Qux |
+
+```python
+foo = 'bar'
+```
+
+[ref]: https://example.com "Example"
+'''
+
+
+def test_translate_md4c_events():
+    pofiles = {}
+    for language in ('es', 'fr'):
+        po = polib.POFile()
+        for msgid in ('Title', 'Item **bold**', 'Baz'):
+            po.append(polib.POEntry(msgid=msgid, msgstr=f'{msgid} {language}'))
+        pofiles[language] = po
+
+    md4c_events = parse_md4c_events(
+        MARKDOWN,
+        Po2Md([]).extensions,
+    )
+    for language, po in pofiles.items():
+        expected_po2md = po2md_from_pofiles([po])
+        expected_output = expected_po2md.translate(MARKDOWN)
+        assert f'# Title {language}' in expected_output
+
+        po2md = po2md_from_pofiles([po])
+        assert translate_md4c_events(po2md, MARKDOWN, md4c_events) == (
+            expected_output
+        )
+        assert [e.msgid for e in po2md.translated_entries] == [
+            e.msgid for e in expected_po2md.translated_entries
+        ]
+        assert [e.msgid for e in po2md.disabled_entries] == [
+            e.msgid for e in expected_po2md.disabled_entries
+        ]
+
+
+def test_po2md_from_pofiles():
+    # PO files not saved to disk
+    po = polib.POFile()
+    for msgid, msgstr in (('Hello', 'Hola'), ('Bye', 'Adiós')):
+        po.append(polib.POEntry(msgid=msgid, msgstr=msgstr))
+    compendium = polib.POFile()
+    compendium.append(polib.POEntry(msgid='Hello', msgstr='Buenas'))
+
+    # translations of latest files take precedence
+    po2md = po2md_from_pofiles([po, compendium], wrapwidth=80)
+    assert po2md.translate('Hello\n\nBye\n') == 'Buenas\n\nAdiós\n'
+    assert po2md.pofiles == [po, compendium]
+
+
+def test_pofiles_saved_at_post_build(mkdocs_build, monkeypatch):
+    """The PO files of the pages are translated from memory, so they are
+    only written at the end of the build.
+    """
+    post_build_started, saved_pofiles = [False], []
+    original_on_post_build = MdpoPlugin.on_post_build
+    original_save_pofile = mkdocs_mdpo_plugin.translations.save_pofile
+
+    def on_post_build(self, config):
+        post_build_started[0] = True
+        return original_on_post_build(self, config)
+
+    def save_pofile(pofile, fpath):
+        assert post_build_started[0], (
+            f"PO file '{fpath}' saved before 'on_post_build' event"
+        )
+        saved_pofiles.append(os.path.basename(fpath))
+        return original_save_pofile(pofile, fpath)
+
+    monkeypatch.setattr(MdpoPlugin, 'on_post_build', on_post_build)
+    monkeypatch.setattr(
+        mkdocs_mdpo_plugin.translations,
+        'save_pofile',
+        save_pofile,
+    )
+
+    def reset_post_build_started(context):
+        post_build_started[0] = False
+
+    mkdocs_build(
+        {'index.md': '# Title\n\nHello\n', 'foo.md': 'Foo\n'},
+        {
+            'es/index.md.po': {'Title': 'Título', 'Hello': 'Hola'},
+            'es/foo.md.po': {'Foo': 'Foo es'},
+        },
+        {'languages': ['en', 'es']},
+        None,
+        {
+            'es/index.html': ['<p>Hola</p>'],
+            'es/foo/index.html': ['<p>Foo es</p>'],
+        },
+        callback_after_first_build=reset_post_build_started,
+        allow_missing_translations=True,
+    )
+    assert 'index.md.po' in saved_pofiles
@@ -1,5 +1,10 @@
+import os
+
+import polib
 import pytest
 
+import mkdocs_mdpo_plugin.translations
+
 
 TESTS = (
     pytest.param(  # material theme
@@ -89,3 +94,85 @@ def test_metadata_translation(
         additional_config,
         expected_output_files,
     )
+
+
+def test_metadata_placed_first_in_pofile(mkdocs_build):
+    """The title and the description of new pages are inserted at the top
+    of their PO files, the title first.
+    """
+    def check_pofile(context):
+        po_filepath = os.path.join(context['docs_dir'], 'es', 'index.md.po')
+        assert [entry.msgid for entry in polib.pofile(po_filepath)] == [
+            'Home page',
+            'Description',
+            'Foo',
+            'Bar',
+        ]
+
+    mkdocs_build(
+        {'index.md': '---\ndescription: "Description"\n---\n\nFoo\n\nBar\n'},
+        {},
+        {'languages': ['en', 'es']},
+        {'nav': [{'Home page': 'index.md'}]},
+        {},
+        callback_after_first_build=check_pofile,
+        interrupt_after_first_build=True,
+    )
+
+
+def test_metadata_translated_at_any_position_of_pofile(
+    mkdocs_build,
+    monkeypatch,
+):
+    """The title and the description are found in the PO files wherever
+    they are placed, so they are translated and not inserted again.
+    """
+    saved_pofiles = {}
+    original_save_pofile = mkdocs_mdpo_plugin.translations.save_pofile
+
+    def save_pofile(pofile, fpath):
+        saved_pofiles[os.path.basename(fpath)] = pofile
+        return original_save_pofile(pofile, fpath)
+
+    monkeypatch.setattr(
+        mkdocs_mdpo_plugin.translations,
+        'save_pofile',
+        save_pofile,
+    )
+
+    def move_metadata_to_the_end(context):
+        po_filepath = os.path.join(context['docs_dir'], 'es', 'index.md.po')
+        po = polib.pofile(po_filepath)
+        metadata_entries = po[:2]
+        del po[:2]
+        po.extend(metadata_entries)
+        po.save(po_filepath)
+
+    mkdocs_build(
+        {'index.md': '---\ndescription: "Description"\n---\n\nFoo\n'},
+        {
+            'es/index.md.po': {
+                'Home page': 'Página de inicio',
+                'Description': 'Descripción',
+                'Foo': 'Foo es',
+            },
+        },
+        {'languages': ['en', 'es']},
+        {
+            'nav': [{'Home page': 'index.md'}],
+            'theme': {'name': 'material'},
+        },
+        {
+            'es/index.html': [
+                '<title>Página de inicio - My site</title>',
+                '<meta name="description" content="Descripción"',
+                '<p>Foo es</p>',
+            ],
+        },
+        callback_after_first_build=move_metadata_to_the_end,
+    )
+
+    assert [
+        entry.msgid for entry in saved_pofiles['index.md.po']
+        if not entry.obsolete
+    ] == ['Foo', 'Home page', 'Description']
@@ -0,0 +1,60 @@
+"""Tests for navigation translation."""
+
+
+def test_navigation_translation(mkdocs_build):
+    mkdocs_build(
+        {
+            'index.md': '# Home\n\nHello\n',
+            'guide/first.md': '# First\n\nFirst guide\n',
+        },
+        {
+            'es/index.md.po': {
+                'Home': 'Inicio',
+                'Hello': 'Hola',
+            },
+            'es/guide/first.md.po': {
+                'First': 'Primera',
+                'First guide': 'Primera guía',
+            },
+            'es/_compendium.po': {
+                'Guides': 'Guías',
+            },
+            'fr/index.md.po': {
+                'Home': 'Accueil',
+                'Hello': 'Salut',
+            },
+            'fr/guide/first.md.po': {
+                'First': 'Première',
+                'First guide': 'Premier guide',
+            },
+            'fr/_compendium.po': {
+                'Guides': 'Guides fr',
+            },
+        },
+        {'languages': ['en', 'es', 'fr']},
+        {
+            'nav': [
+                {'Home': 'index.md'},
+                {'Guides': [{'First': 'guide/first.md'}]},
+            ],
+        },
+        {
+            'index.html': [
+                '<a href="." class="nav-link">Home</a>',
+                'data-toggle="dropdown">Guides <b class="caret"></b></a>',
+                '<a href="guide/first/" class="dropdown-item">First</a>',
+            ],
+            'es/guide/first/index.html': [
+                '<a href="../../" class="nav-link">Inicio</a>',
+                'data-toggle="dropdown">Guías <b class="caret"></b></a>',
+                '<a href="./" class="dropdown-item active">Primera</a>',
+                '<a rel="prev" href="../../" class="nav-link">',
+            ],
+            'fr/guide/first/index.html': [
+                '<a href="../../" class="nav-link">Accueil</a>',
+                'data-toggle="dropdown">Guides fr <b class="caret"></b></a>',
+                '<a href="./" class="dropdown-item active">Première</a>',
+                '<a rel="prev" href="../../" class="nav-link">',
+            ],
+        },
+    )
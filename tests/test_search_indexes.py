@@ -5,6 +5,8 @@ import os
 
 import pytest
 
+from mkdocs_mdpo_plugin import search_indexes
+
 
 TESTS = (
     pytest.param(  # mkdocs theme
@@ -163,7 +165,26 @@ def test_search_indexes(
     additional_config,
     expected_output_files,
     mkdocs_build,
+    monkeypatch,
 ):
+    # the search index is taken from memory, so the serialized
+    # 'search_index.json' file is never parsed
+    def json_load(*args, **kwargs):
+        raise AssertionError("'search_index.json' must not be parsed")
+
+    monkeypatch.setattr(search_indexes.json, 'load', json_load)
+
+    # HTML files are patched before being written, so the patcher
+    # never reads them back from the site directory
+    read_html_files = []
+
+    def open_(fpath, mode='r', *args, **kwargs):
+        if fpath.endswith('.html') and 'r' in mode:
+            read_html_files.append(fpath)
+        return open(fpath, mode, *args, **kwargs)
+
+    monkeypatch.setattr(search_indexes, 'open', open_, raising=False)
+
     def check_search_indexes(context):
         search_dir = os.path.join(context['site_dir'], 'search')
 
@@ -198,3 +219,267 @@ def test_search_indexes(
         expected_output_files,
         callback_after_first_build=check_search_indexes,
     )
+    assert read_html_files == []
+
+
+@pytest.mark.parametrize(
+    ('theme', 'worker_files'),
+    (
+        pytest.param('mkdocs', ['search/main.js', 'search/worker.js']),
+        pytest.param('readthedocs', ['search/main.js', 'search/worker.js']),
+        pytest.param('material', []),
+    ),
+)
+def test_shared_search_index(theme, worker_files, mkdocs_build):
+    def check_shared_search_index(context):
+        site_dir = context['site_dir']
+        search_dir = os.path.join(site_dir, 'search')
+
+        # only one search index and one set of worker files are created
+        assert sorted(
+            fname for fname in os.listdir(search_dir)
+            if fname.startswith(('search_index', 'main', 'worker'))
+        ) == (
+            ['main.js', 'search_index.json', 'worker.js']
+            if worker_files else ['search_index.json']
+        )
+        assert not os.path.isfile(os.path.join(site_dir, 'search_es.html'))
+
+        with open(os.path.join(search_dir, 'search_index.json')) as f:
+            search_index = json.load(f)
+        assert search_index['docs']
+        for record in search_index['docs']:
+            assert record['lang'] == (
+                'es' if record['location'].startswith('es/') else 'en'
+            )
+
+        js_files = list(worker_files)
+        if theme == 'material':
+            javascripts_dir = os.path.join(site_dir, 'assets', 'javascripts')
+            js_files.extend(
+                os.path.join('assets', 'javascripts', fname)
+                for fname in os.listdir(javascripts_dir)
+                if fname.endswith('.js')
+            )
+            assert len(js_files) == 1
+
+        for fname in js_files:
+            with open(os.path.join(site_dir, fname)) as f:
+                content = f.read()
+            assert content.count(
+                search_indexes.SHARED_SEARCH_INDEX_JS_MARKER,
+            ) == 1
+
+    mkdocs_build(
+        {
+            'index.md': '# Foo\n\nBar\n',
+            'baz.md': 'Baz\n',
+        },
+        {
+            'es/index.md.po': {
+                'Foo': 'Foo es',
+                'Bar': 'Bar es',
+            },
+            'es/baz.md.po': {
+                'Baz': 'Baz es',
+            },
+        },
+        {
+            'languages': ['en', 'es'],
+            'cross_language_search': False,
+            'shared_search_index': True,
+        },
+        {
+            'plugins': [
+                {
+                    'search': {},
+                },
+            ],
+            'theme': {
+                'name': theme,
+            },
+        },
+        {
+            'index.html': [
+                '<p>Bar</p>',
+            ],
+            'es/index.html': [
+                '<p>Bar es</p>',
+            ],
+            'search/search_index.json': [
+                '"lang":"es"',
+                '"location":"baz/"',
+            ],
+        },
+        callback_after_first_build=check_shared_search_index,
+    )
+
+
+@pytest.mark.parametrize('theme', ('mkdocs', 'material'))
+def test_prebuilt_search_indexes(theme, mkdocs_build):
+    pytest.importorskip('lunr')
+    pytest.importorskip('nltk')  # language support of lunr
+
+    def check_prebuilt_search_indexes(context):
+        search_dir = os.path.join(context['site_dir'], 'search')
+
+        for language in ('en', 'es'):
+            fpath = os.path.join(search_dir, f'search_index_{language}.json')
+            with open(fpath) as f:
+                search_index = json.load(f)
+
+            # the prebuilt index only includes the records of the language
+            locations = {record['location'] for record in search_index['docs']}
+            assert locations
+            assert {
+                field_ref.split('/', 1)[1]
+                for field_ref, _ in search_index['index']['fieldVectors']
+            } == locations
+
+            # the index is built and searched with the language pipeline
+            assert search_index['config']['lang'] == [language]
+            assert search_index['index']['pipeline'] == [
+                'stemmer' if language == 'en' else f'stemmer-{language}',
+            ]
+        if theme == 'mkdocs':
+            # loaded by the worker of the 'search' plugin
+            assert os.path.isfile(os.path.join(search_dir, 'lunr.es.js'))
+
+    mkdocs_build(
+        {
+            'index.md': '# Foo\n\nBar\n',
+        },
+        {
+            'es/index.md.po': {
+                'Foo': 'Foo es',
+                'Bar': 'Bar es',
+            },
+        },
+        {
+            'languages': ['en', 'es'],
+            'cross_language_search': False,
+        },
+        {
+            'plugins': [
+                {
+                    'search': {
+                        'prebuild_index': 'python',
+                    },
+                },
+            ],
+            'theme': {
+                'name': theme,
+            },
+        },
+        {
+            'search/search_index_es.json': [
+                '"location":"es/"',
+                '"index":',
+            ],
+        },
+        callback_after_first_build=check_prebuilt_search_indexes,
+    )
+
+
+def test_prebuilt_search_indexes_without_language_support(
+    mkdocs_build,
+    monkeypatch,
+):
+    pytest.importorskip('lunr')
+    monkeypatch.setattr(search_indexes, 'LUNR_LANGUAGE_SUPPORT', False)
+
+    def check_prebuilt_search_indexes(context):
+        search_dir = os.path.join(context['site_dir'], 'search')
+
+        with open(os.path.join(search_dir, 'search_index_en.json')) as f:
+            search_index = json.load(f)
+        assert search_index['index']['pipeline'] == ['stemmer']
+
+        # built in the browser with the pipeline of the language
+        with open(os.path.join(search_dir, 'search_index_es.json')) as f:
+            search_index = json.load(f)
+        assert search_index['config']['lang'] == ['es']
+        assert 'index' not in search_index
+
+    _, plugin_log = mkdocs_build(
+        {
+            'index.md': '# Foo\n\nBar\n',
+        },
+        {},
+        {
+            'languages': ['en', 'es'],
+            'cross_language_search': False,
+        },
+        {
+            'plugins': [
+                {
+                    'search': {
+                        'prebuild_index': 'python',
+                    },
+                },
+            ],
+        },
+        {},
+        callback_after_first_build=check_prebuilt_search_indexes,
+        interrupt_after_first_build=True,
+    )
+    assert (
+        "The search index for the language 'es' can not be prebuilt"
+    ) in plugin_log
+    assert "for the language 'en'" not in plugin_log
+
+
+def test_sharded_search_indexes(mkdocs_build):
+    def check_sharded_search_indexes(context):
+        search_dir = os.path.join(context['site_dir'], 'search')
+
+        for language in ('en', 'es'):
+            prefix = '' if language == 'en' else f'{language}/'
+
+            with open(
+                os.path.join(search_dir, f'search_index_{language}.json'),
+            ) as f:
+                manifest = json.load(f)
+            assert manifest['docs'] == []
+
+            shards_locations = []
+            for shard_fname in manifest['shards']:
+                with open(os.path.join(search_dir, shard_fname)) as f:
+                    shard = json.load(f)
+                shards_locations.append(
+                    [record['location'] for record in shard['docs']],
+                )
+
+            # records of the same top level section are kept together
+            assert shards_locations == [
+                [prefix, f'{prefix}qux/'],
+                [f'{prefix}foo/bar/', f'{prefix}foo/baz/'],
+            ]
+
+        with open(os.path.join(search_dir, 'worker_es.js')) as f:
+            assert 'mdpoSearchOnDemand' in f.read()
+
+    mkdocs_build(
+        {
+            'index.md': 'Foo\n',
+            'foo/bar.md': 'Bar\n',
+            'foo/baz.md': 'Baz\n',
+            'qux.md': 'Qux\n',
+        },
+        {},
+        {
+            'languages': ['en', 'es'],
+            'cross_language_search': False,
+            'search_index_shard_size': 110,
+        },
+        {
+            'plugins': [
+                {
+                    'search': {},
+                },
+            ],
+        },
+        {},
+        callback_after_first_build=check_sharded_search_indexes,
+        interrupt_after_first_build=True,
+    )
@@ -0,0 +1,233 @@
+"""Tests for translations data structures of mkdocs-mdpo-plugin."""
+
+import os
+
+import polib
+import pytest
+
+from mkdocs_mdpo_plugin.translations import (
+    IndexedPOFile,
+    Translation,
+    Translations,
+)
+
+
+def test_indexed_pofile_index():
+    po = polib.pofile(
+        '#\nmsgid ""\nmsgstr ""\n\nmsgid "Hello"\nmsgstr "Hola"\n\n'
+        'msgctxt "Greeting"\nmsgid "Hello"\nmsgstr "Buenas"\n\n'
+        'msgid "Bye"\nmsgstr ""\n',
+        klass=IndexedPOFile,
+    )
+
+    # metadata entry is removed from the index after parsing
+    assert '' not in po.msgid_entries
+    assert list(po.msgid_entries) == ['Hello', 'Bye']
+    assert [e.msgstr for e in po.msgid_entries['Hello']] == ['Hola', 'Buenas']
+
+    # insertions at the beginning are indexed before existing entries
+    po.insert(0, polib.POEntry(msgid='Hello', msgstr='Qué tal'))
+    assert [e.msgstr for e in po.msgid_entries['Hello']] == [
+        'Qué tal', 'Hola', 'Buenas',
+    ]
+
+    # insertions at other positions are indexed in the order of the file
+    po.insert(2, polib.POEntry(msgid='Hello', msgstr='Hey'))
+    assert [e.msgstr for e in po.msgid_entries['Hello']] == [
+        'Qué tal', 'Hola', 'Hey', 'Buenas',
+    ]
+    assert po.msgid_entries['Hello'] == [e for e in po if e.msgid == 'Hello']
+    po.remove(po.msgid_entries['Hello'][2])
+
+    # negative indexes are handled as in lists
+    po.insert(-1, polib.POEntry(msgid='Hello', msgstr='Hi'))
+    assert po[-2].msgstr == 'Hi'
+    assert po.msgid_entries['Hello'] == [e for e in po if e.msgid == 'Hello']
+    po.remove(po[-2])
+
+    po.append(polib.POEntry(msgid='Foo', msgstr=''))
+    assert po.msgid_entries['Foo'] == [po[-1]]
+
+    # entries are removed by identity
+    po.remove(po.msgid_entries['Hello'][1])
+    assert [e.msgstr for e in po.msgid_entries['Hello']] == [
+        'Qué tal', 'Buenas',
+    ]
+    assert [e.msgstr for e in po if e.msgid == 'Hello'] == [
+        'Qué tal', 'Buenas',
+    ]
+
+    po.remove(po.msgid_entries['Bye'][0])
+    assert 'Bye' not in po.msgid_entries
+
+
+def test_indexed_pofile_remove_entries():
+    po = IndexedPOFile()
+    for msgid, msgstr in (
+        ('Hello', 'Hola'),
+        ('Bye', ''),
+        ('Hello', 'Buenas'),
+        ('Foo', 'Bar'),
+    ):
+        po.append(polib.POEntry(msgid=msgid, msgstr=msgstr))
+    stats = {'translated': 0, 'total': 0}
+    po.track_stats(stats)
+
+    # entries are removed by identity in one pass
+    po.remove_entries([po[2], po[3], po[1]])
+    assert [(e.msgid, e.msgstr) for e in po] == [('Hello', 'Hola')]
+    assert po.msgid_entries == {'Hello': [po[0]]}
+    assert (po.n_translated, po.n_total) == (1, 1)
+    assert stats == {'translated': 1, 'total': 1}
+
+    with pytest.raises(ValueError, match='1 entries not found'):
+        po.remove_entries([polib.POEntry(msgid='Hello', msgstr='Hola')])
+    assert len(po) == 1
+
+
+def test_indexed_pofile_merge():
+    po = polib.pofile(
+        '#\nmsgid ""\nmsgstr ""\n\nmsgid "Hello"\nmsgstr "Hola"\n\n'
+        'msgctxt "Greeting"\nmsgid "Hi"\nmsgstr "Buenas"\n\n'
+        '#~ msgid "Bye"\n#~ msgstr "Adiós"\n',
+        klass=IndexedPOFile,
+    )
+    entries = [
+        polib.POEntry(msgid='Hello', msgstr=''),
+        polib.POEntry(msgid='Hi', msgstr=''),
+        polib.POEntry(msgid='Hi', msgctxt='Greeting', msgstr=''),
+        polib.POEntry(msgid='Bye', msgstr=''),
+        polib.POEntry(msgid='Bye', msgstr=''),
+    ]
+
+    # same result as appending the entries not found with 'in' operator
+    expected_po = polib.pofile(str(po))
+    for entry in entries:
+        if entry not in expected_po:
+            expected_po.append(entry)
+
+    po.merge(entries)
+    assert str(po) == str(expected_po)
+    assert [e.msgid for e in po] == ['Hello', 'Hi', 'Bye', 'Hi', 'Bye']
+    assert po[-1] is entries[3]
+    assert len(po.msgid_entries['Bye']) == 2
+
+    # copied entries
+    new_entry = polib.POEntry(msgid='Foo', msgstr='Bar')
+    po.merge([new_entry], copy_entries=True)
+    assert po[-1] is not new_entry
+    assert po[-1].msgstr == 'Bar'
+
+
+def test_indexed_pofile_stats():
+    po = polib.pofile(
+        '#\nmsgid ""\nmsgstr ""\n\nmsgid "Hello"\nmsgstr "Hola"\n\n'
+        'msgid "Bye"\nmsgstr ""\n\n#~ msgid "Foo"\n#~ msgstr ""\n',
+        klass=IndexedPOFile,
+    )
+    assert (po.n_translated, po.n_total) == (2, 3)
+
+    stats = {'translated': 1, 'total': 1}
+    po.track_stats(stats)
+    assert stats == {'translated': 3, 'total': 4}
+
+    # changes are reported to tracked statistics
+    po.append(polib.POEntry(msgid='Baz', msgstr=''))
+    po.insert(0, polib.POEntry(msgid='Qux', msgstr='Quux'))
+    assert (po.n_translated, po.n_total) == (3, 5)
+    assert stats == {'translated': 4, 'total': 6}
+
+    # removed entries are discounted as they were counted
+    entry = po.msgid_entries['Foo'][0]
+    entry.obsolete = False
+    po.remove(entry)
+    assert (po.n_translated, po.n_total) == (2, 4)
+    assert stats == {'translated': 3, 'total': 5}
+
+
+def test_translation_po_msgids():
+    po = IndexedPOFile()
+    for msgid in ('Hello', 'Bye', 'Hello'):
+        po.append(polib.POEntry(msgid=msgid, msgstr=''))
+    translation = Translation('es', po, None, set(), set(), set())
+
+    # unique msgids in the order they were added to the PO file
+    assert list(translation.po_msgids) == ['Hello', 'Bye']
+    assert 'Bye' in translation.po_msgids
+
+    # entries added while the page is rendered are included, ordered as
+    # they were added wherever they are inserted
+    po.insert(0, polib.POEntry(msgid='Title', msgstr=''))
+    po.append(polib.POEntry(msgid='Foo', msgstr=''))
+    assert list(translation.po_msgids) == ['Hello', 'Bye', 'Title', 'Foo']
+
+
+def test_indexed_pofile_inserted_at_beginning_by_builds(
+    mkdocs_build,
+    monkeypatch,
+):
+    """The plugin only inserts entries at the beginning of the PO files,
+    where they are indexed in constant time.
+    """
+    insertion_indexes = []
+    original_insert = IndexedPOFile.insert
+
+    def insert(self, index, entry):
+        insertion_indexes.append(index)
+        return original_insert(self, index, entry)
+
+    monkeypatch.setattr(IndexedPOFile, 'insert', insert)
+
+    mkdocs_build(
+        {
+            'index.md': '---\ndescription: Description\n---\n\nHello\n',
+            'foo.md': '# Foo\n\nHello\n',
+        },
+        {},
+        {
+            'languages': ['en', 'es'],
+            'translate': ['site_name', 'site_description'],
+        },
+        {'site_description': 'The description of the site'},
+        {},
+        interrupt_after_first_build=True,
+    )
+    assert insertion_indexes
+    assert set(insertion_indexes) == {0}
+
+
+def test_translations_flush_pofiles(tmp_path):
+    translations = Translations()
+
+    saved_filepath = str(tmp_path / 'saved.po')
+    removed_filepath = str(tmp_path / 'removed.po')
+    with open(removed_filepath, 'w') as f:
+        f.write('')
+
+    po = IndexedPOFile()
+    po.append(polib.POEntry(msgid='Hello', msgstr='Hola'))
+    translations.mark_dirty(po, saved_filepath)
+    translations.mark_dirty(None, removed_filepath)
+    assert not os.path.isfile(saved_filepath)
+
+    translations.flush_pofiles()
+    assert translations.dirty_pofiles == {}
+    assert not os.path.isfile(removed_filepath)
+    with open(saved_filepath) as f:
+        assert f.read() == str(po)
+
+    # unchanged files are not rewritten
+    os.utime(saved_filepath, ns=(0, 0))
+    translations.mark_dirty(po, saved_filepath)
+    translations.flush_pofiles()
+    assert os.stat(saved_filepath).st_mtime_ns == 0
+
+    # previous file is preserved if the writing fails
+    po.append(polib.POEntry(msgid='Bye', msgstr='Adiós'))
+    po.encoding = 'unknown-encoding'
+    translations.mark_dirty(po, saved_filepath)
+    with pytest.raises(LookupError):
+        translations.flush_pofiles()
+    with open(saved_filepath) as f:
+        assert 'Bye' not in f.read()
+    assert os.listdir(tmp_path) == ['saved.po']
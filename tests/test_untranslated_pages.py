@@ -0,0 +1,123 @@
+"""Tests for rendering of excluded and untranslated pages."""
+
+import mkdocs_mdpo_plugin.plugin
+from mkdocs_mdpo_plugin import extensions
+from mkdocs_mdpo_plugin.plugin import MdpoPlugin
+
+
+INPUT_FILES_CONTENTS = {
+    'index.md': '''# Home
+
+Hello [guide](guide/page.md).
+
+!!! note "Admonition title"
+
+    Admonition content
+''',
+    'guide/page.md': '''# Guide
+
+Go [home](../index.md "Home title") and [changelog](../changelog.md).
+''',
+    'changelog.md': '''# Changelog
+
+Some changes.
+''',
+}
+
+TRANSLATIONS = {
+    'es/index.md.po': {
+        'Home': 'Inicio',
+        'Hello [guide](guide/page.md).': 'Hola [guía](guide/page.md).',
+        'Admonition title': 'Título de advertencia',
+        'Admonition content': 'Contenido de advertencia',
+    },
+}
+
+
+def _build_translated_pages(mkdocs_build, monkeypatch, use_rendered_tree):
+    outputs, tree_renders = {}, []
+
+    original_on_post_page = MdpoPlugin.on_post_page
+
+    def on_post_page(self, output, page, config):
+        if hasattr(page.file, '_mdpo_language'):
+            outputs[page.url] = (output, str(page.toc))
+        return original_on_post_page(self, output, page, config)
+
+    monkeypatch.setattr(MdpoPlugin, 'on_post_page', on_post_page)
+
+    def render_untranslated_tree(rendered_tree, tr, msgids, relpath):
+        rendered = None
+        if use_rendered_tree:
+            rendered = extensions.render_untranslated_tree(
+                rendered_tree, tr, msgids, relpath,
+            )
+        tree_renders.append((tr.language, rendered is not None))
+        return rendered
+
+    monkeypatch.setattr(
+        mkdocs_mdpo_plugin.plugin,
+        'render_untranslated_tree',
+        render_untranslated_tree,
+    )
+
+    mkdocs_build(
+        INPUT_FILES_CONTENTS,
+        TRANSLATIONS,
+        {
+            'languages': ['en', 'es', 'fr'],
+            'exclude': ['changelog.md'],
+        },
+        {'markdown_extensions': ['admonition', 'toc']},
+        {
+            'es/index.html': [
+                '<h1 id="inicio">Inicio</h1>',
+                '<p class="admonition-title">Título de advertencia</p>',
+            ],
+            'es/guide/page/index.html': [
+                '<h1 id="guide">Guide</h1>',
+            ],
+            'fr/index.html': [
+                '<h1 id="home">Home</h1>',
+                '<p class="admonition-title">Admonition title</p>',
+            ],
+            'fr/changelog/index.html': [
+                '<p>Some changes.</p>',
+            ],
+        },
+        allow_missing_translations=True,
+    )
+    return outputs, tree_renders
+
+
+def test_untranslated_pages(mkdocs_build, monkeypatch):
+    expected_outputs, _ = _build_translated_pages(
+        mkdocs_build,
+        monkeypatch,
+        False,
+    )
+    outputs, tree_renders = _build_translated_pages(
+        mkdocs_build,
+        monkeypatch,
+        True,
+    )
+    assert outputs == expected_outputs
+    assert outputs
+
+    assert tree_renders == [
+        # first build, the texts of the admonition are not in the PO files
+        # of the index yet, so they are added rendering the pages
+        ('es', False),
+        ('fr', False),
+        # excluded 'changelog.md' and untranslated 'guide/page.md'
+        ('es', True),
+        ('fr', True),
+        ('es', True),
+        ('fr', True),
+        # second build, only the French index is untranslated
+        ('fr', True),
+        ('es', True),
+        ('fr', True),
+        ('es', True),
+        ('fr', True),
+    ]
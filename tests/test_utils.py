@@ -0,0 +1,53 @@
+"""Tests for utilities of mkdocs-mdpo-plugin."""
+
+import jinja2
+import pytest
+
+from mkdocs_mdpo_plugin.utils import build_dest_filename_renderer
+
+
+class FakeFile:
+    dest_path = 'foo/index.html'
+    src_path = 'foo.md'
+
+
+@pytest.mark.parametrize(
+    ('template', 'expected_result', 'uses_jinja2'),
+    (
+        ('{{language}}/{{file.dest_path}}', 'es/foo/index.html', False),
+        ('{{ language }}/{{ file.dest_path }}', 'es/foo/index.html', False),
+        ('{{locale_dir}}/{{file.src_path}}', 'locale/foo.md', False),
+        ('{{language}}/{{file.unknown}}', 'es/', False),
+        (
+            '{{file.dest_path|replace(".html", "")}}-{{language}}.html',
+            'foo/index-es.html',
+            True,
+        ),
+        ('{% if true %}{{language}}{% endif %}', 'es', True),
+    ),
+)
+def test_build_dest_filename_renderer(
+    template,
+    expected_result,
+    uses_jinja2,
+    monkeypatch,
+):
+    plugin_config = {
+        'locale_dir': 'locale',
+        'dest_filename_template': template,
+    }
+
+    jinja2_templates = []
+    Template = jinja2.Template
+    monkeypatch.setattr(
+        jinja2,
+        'Template',
+        lambda *args: jinja2_templates.append(args) or Template(*args),
+    )
+
+    render = build_dest_filename_renderer(template, plugin_config)
+    assert render(FakeFile, 'es') == expected_result
+    assert render(FakeFile, 'es') == Template(template).render(
+        file=FakeFile, language='es', **plugin_config,
+    )
+    assert len(jinja2_templates) == (1 if uses_jinja2 else 0)